@@ -0,0 +1,324 @@
+"""
+ARXML to Excel
+反向转换：读取已有 SWC 的 ARXML，生成与 myswcautosar.xlsx 相同格式的三个 sheet（主 sheet、Struct、CSOperation）
+数组类型还原为 BaseType[N] 写法，结构体共享初始值常量（<Struct>_IV）中的非零成员值还原到 InitValue 列
+使用 lxml iterparse 流式解析，每处理完一个包元素即释放，大型 ARXML 不需要载入完整 DOM；
+使用 openpyxl 只写模式批量写出
+"""
+import sys
+from lxml import etree
+from openpyxl import Workbook
+
+MAIN_SHEET = 'Overview'
+MAIN_COLUMNS = ['ItemNumber', 'SWCName', 'Direction', 'PortName', 'InterfaceName',
+                'ElementName', 'InterfaceType', 'ElementDataType']
+STRUCT_COLUMNS = ['StructName', 'MemberName', 'MemberType', 'InitValue']
+CSOP_COLUMNS = ['InterfaceName', 'OperationName', 'ArgumentName', 'ArgumentDirection', 'ArgumentType']
+
+# 不带自定义参数的 CS operation 在主 sheet 中的数据类型列（参数定义在 CSOperation sheet）
+CUSTOM_ARGS_DATA_TYPE = 'NULL'
+
+SWC_TAGS = {'APPLICATION-SW-COMPONENT-TYPE', 'SENSOR-ACTUATOR-SW-COMPONENT-TYPE',
+            'COMPLEX-DEVICE-DRIVER-SW-COMPONENT-TYPE', 'ECU-ABSTRACTION-SW-COMPONENT-TYPE',
+            'SERVICE-SW-COMPONENT-TYPE'}
+
+
+def _local(tag):
+    return tag.rpartition('}')[2]
+
+
+def _child(elem, name):
+    for child in elem:
+        if _local(child.tag) == name:
+            return child
+    return None
+
+
+def _children(elem, *path):
+    """按本地名逐级查找子元素，返回最后一级的全部匹配"""
+    nodes = [elem]
+    for name in path:
+        nodes = [child for node in nodes for child in node if _local(child.tag) == name]
+    return nodes
+
+
+def _text(elem, name):
+    child = _child(elem, name)
+    return child.text.strip() if child is not None and child.text else None
+
+
+def _ref_name(ref):
+    """引用路径的最后一段即元素名"""
+    return ref.rsplit('/', 1)[-1] if ref else None
+
+
+def _element_path(elem):
+    """元素的完整引用路径（向上取各级 AR-PACKAGE 的 SHORT-NAME）"""
+    names = [_text(elem, 'SHORT-NAME')]
+    parent = elem.getparent()
+    while parent is not None:
+        if _local(parent.tag) == 'AR-PACKAGE':
+            names.append(_text(parent, 'SHORT-NAME'))
+        parent = parent.getparent()
+    return '/' + '/'.join(reversed(names))
+
+
+def _type_ref(elem):
+    """数据原型/结构体成员引用的类型名"""
+    for node in elem.iter():
+        if _local(node.tag) in ('TYPE-TREF', 'IMPLEMENTATION-DATA-TYPE-REF') and node.text:
+            return _ref_name(node.text.strip())
+    return None
+
+
+def _parse_sr_interface(elem):
+    elements = []
+    for prototype in _children(elem, 'DATA-ELEMENTS', 'VARIABLE-DATA-PROTOTYPE'):
+        elements.append({'element_name': _text(prototype, 'SHORT-NAME'), 'data_type': _type_ref(prototype)})
+    return {'name': _text(elem, 'SHORT-NAME'), 'interface_type': 'SenderReceiver', 'elements': elements}
+
+
+def _parse_cs_interface(elem):
+    operations = []
+    for operation in _children(elem, 'OPERATIONS', 'CLIENT-SERVER-OPERATION'):
+        arguments = []
+        for argument in _children(operation, 'ARGUMENTS', 'ARGUMENT-DATA-PROTOTYPE'):
+            arguments.append({'arg_name': _text(argument, 'SHORT-NAME'),
+                              'arg_direction': _text(argument, 'DIRECTION'),
+                              'arg_type': _type_ref(argument)})
+        operations.append({'operation_name': _text(operation, 'SHORT-NAME'), 'arguments': arguments})
+    return {'name': _text(elem, 'SHORT-NAME'), 'interface_type': 'ClientServer', 'operations': operations}
+
+
+def _parse_struct(elem):
+    members = []
+    for member in _children(elem, 'SUB-ELEMENTS', 'IMPLEMENTATION-DATA-TYPE-ELEMENT'):
+        members.append({'member_name': _text(member, 'SHORT-NAME'), 'member_type': _type_ref(member)})
+    return members
+
+
+def _parse_array(elem):
+    """ARRAY 类型 -> (元素类型名, 长度)"""
+    array_element = _children(elem, 'SUB-ELEMENTS', 'IMPLEMENTATION-DATA-TYPE-ELEMENT')
+    if not array_element:
+        return None
+    size = _text(array_element[0], 'ARRAY-SIZE')
+    return _type_ref(array_element[0]), int(size) if size else None
+
+
+def _numeric(elem):
+    """数值初始值；数组中所有元素相同时取该值"""
+    tag = _local(elem.tag)
+    if tag == 'NUMERICAL-VALUE-SPECIFICATION':
+        value = _text(elem, 'VALUE')
+        if value is None:
+            return None
+        number = float(value)
+        return int(number) if number.is_integer() else number
+    if tag == 'ARRAY-VALUE-SPECIFICATION':
+        values = {_numeric(item) for item in _children(elem, 'ELEMENTS')[0]} if _children(elem, 'ELEMENTS') else set()
+        return values.pop() if len(values) == 1 else None
+    return None
+
+
+def _parse_record_constant(elem):
+    """结构体常量的 { 成员标签: 数值初始值 }，非结构体常量返回 None"""
+    records = _children(elem, 'VALUE-SPEC', 'RECORD-VALUE-SPECIFICATION')
+    if not records:
+        return None
+    values = {}
+    for field in _children(records[0], 'FIELDS')[0] if _children(records[0], 'FIELDS') else []:
+        label = _text(field, 'SHORT-LABEL')
+        if label is not None:
+            values[label] = _numeric(field)
+    return values
+
+
+def _parse_swc(elem):
+    ports = []
+    ports_elem = _child(elem, 'PORTS')
+    for port in ports_elem if ports_elem is not None else []:
+        kind = _local(port.tag)
+        if kind == 'P-PORT-PROTOTYPE':
+            direction, tref, specs = 'provide', 'PROVIDED-INTERFACE-TREF', 'PROVIDED-COM-SPECS'
+        elif kind == 'R-PORT-PROTOTYPE':
+            direction, tref, specs = 'require', 'REQUIRED-INTERFACE-TREF', 'REQUIRED-COM-SPECS'
+        else:
+            print(f"Warning: Unsupported port kind {kind} ({_text(port, 'SHORT-NAME')}), skipping")
+            continue
+
+        # CS 端口在 com-spec 中引用的 operation
+        operation_names = []
+        specs_elem = _child(port, specs)
+        if specs_elem is not None:
+            for node in specs_elem.iter():
+                if _local(node.tag) == 'OPERATION-REF' and node.text:
+                    operation_names.append(_ref_name(node.text.strip()))
+        ports.append({'port_name': _text(port, 'SHORT-NAME'),
+                      'direction': direction,
+                      'interface_ref': _text(port, tref),
+                      'operation_names': list(dict.fromkeys(operation_names))})
+    return {'name': _text(elem, 'SHORT-NAME'), 'ports': ports}
+
+
+def parse_arxml(arxml_file):
+    """
+    流式解析 ARXML 中的接口、结构体类型和 SWC 端口
+    返回: { 'interfaces': {ref: info}, 'structs': {name: [members]}, 'arrays': {name: (base, size)},
+            'constants': {name: {label: value}}, 'swcs': [ {name, ports} ] }
+    """
+    interfaces = {}
+    structs = {}
+    arrays = {}
+    constants = {}
+    swcs = []
+
+    for _, elem in etree.iterparse(arxml_file, events=('end',), remove_comments=True):
+        parent = elem.getparent()
+        # 只处理包中的直接元素（AR-PACKAGE/ELEMENTS 的子元素，数组初始值中的 ELEMENTS 除外），处理完立即释放
+        if parent is None or _local(parent.tag) != 'ELEMENTS' or _local(parent.getparent().tag) != 'AR-PACKAGE':
+            continue
+
+        tag = _local(elem.tag)
+        if tag == 'SENDER-RECEIVER-INTERFACE':
+            interfaces[_element_path(elem)] = _parse_sr_interface(elem)
+        elif tag == 'CLIENT-SERVER-INTERFACE':
+            interfaces[_element_path(elem)] = _parse_cs_interface(elem)
+        elif tag == 'IMPLEMENTATION-DATA-TYPE' and _text(elem, 'CATEGORY') == 'STRUCTURE':
+            structs[_text(elem, 'SHORT-NAME')] = _parse_struct(elem)
+        elif tag == 'IMPLEMENTATION-DATA-TYPE' and _text(elem, 'CATEGORY') == 'ARRAY':
+            array = _parse_array(elem)
+            if array is not None and array[1]:
+                arrays[_text(elem, 'SHORT-NAME')] = array
+        elif tag == 'CONSTANT-SPECIFICATION':
+            values = _parse_record_constant(elem)
+            if values is not None:
+                constants[_text(elem, 'SHORT-NAME')] = values
+        elif tag in SWC_TAGS:
+            swcs.append(_parse_swc(elem))
+
+        elem.clear(keep_tail=True)
+        while elem.getprevious() is not None:
+            del parent[0]
+
+    print(f"Parsed ARXML: {len(interfaces)} interfaces, {len(structs)} structs, {len(swcs)} SWC(s)")
+    return {'interfaces': interfaces, 'structs': structs, 'arrays': arrays, 'constants': constants, 'swcs': swcs}
+
+
+def _is_default_operation(operation):
+    """
+    判断 operation 是否为生成器的默认参数形式（invalue IN + outvalue OUT，类型相同），
+    是则返回该类型，主 sheet 中直接填写数据类型，不需要 CSOperation 行
+    """
+    arguments = {(arg['arg_name'], arg['arg_direction']): arg['arg_type'] for arg in operation['arguments']}
+    if len(arguments) == 2 and set(arguments) == {('invalue', 'IN'), ('outvalue', 'OUT')}:
+        types = set(arguments.values())
+        if len(types) == 1:
+            return types.pop()
+    return None
+
+
+def _sheet_type(type_name, arrays):
+    """数组类型名还原为 BaseType[N]"""
+    if type_name in arrays:
+        base_type, size = arrays[type_name]
+        return f"{base_type}[{size}]"
+    return type_name
+
+
+def build_sheet_rows(parsed):
+    """
+    将解析结果展开为三个 sheet 的行
+    返回 (main_rows, struct_rows, csop_rows)
+    """
+    main_rows = []
+    csop_rows = []
+    emitted_operations = set()
+    arrays = parsed['arrays']
+
+    for swc in parsed['swcs']:
+        for port in swc['ports']:
+            interface = parsed['interfaces'].get(port['interface_ref'])
+            if interface is None:
+                print(f"Warning: Interface {port['interface_ref']} of port {port['port_name']} not found, skipping")
+                continue
+
+            if interface['interface_type'] == 'SenderReceiver':
+                for element in interface['elements']:
+                    main_rows.append([swc['name'], port['direction'], port['port_name'], interface['name'],
+                                      element['element_name'], 'SenderReceiver',
+                                      _sheet_type(element['data_type'], arrays)])
+                continue
+
+            operations = {operation['operation_name']: operation for operation in interface['operations']}
+            # 端口 com-spec 中引用的 operation；没有 com-spec 时使用接口的全部 operation
+            for operation_name in port['operation_names'] or list(operations):
+                operation = operations.get(operation_name)
+                if operation is None:
+                    print(f"Warning: Operation {operation_name} not found in interface {interface['name']}, skipping")
+                    continue
+                data_type = _is_default_operation(operation)
+                if data_type is None:
+                    data_type = CUSTOM_ARGS_DATA_TYPE
+                    key = (interface['name'], operation_name)
+                    if key not in emitted_operations:
+                        emitted_operations.add(key)
+                        for argument in operation['arguments']:
+                            csop_rows.append([interface['name'], operation_name, argument['arg_name'],
+                                              argument['arg_direction'], _sheet_type(argument['arg_type'], arrays)])
+                main_rows.append([swc['name'], port['direction'], port['port_name'], interface['name'],
+                                  operation_name, 'ClientServer', data_type])
+
+    struct_rows = []
+    for struct_name, members in parsed['structs'].items():
+        init_values = parsed['constants'].get(f"{struct_name}_IV", {})
+        for member in members:
+            # 初始值为 0 时留空（与默认值相同）
+            init_value = init_values.get(member['member_name']) or None
+            struct_rows.append([struct_name, member['member_name'],
+                                _sheet_type(member['member_type'], arrays), init_value])
+    return main_rows, struct_rows, csop_rows
+
+
+def write_workbook(excel_file, main_rows, struct_rows, csop_rows):
+    """
+    以 openpyxl 只写模式写出三个 sheet
+    """
+    workbook = Workbook(write_only=True)
+
+    sheet = workbook.create_sheet(MAIN_SHEET)
+    sheet.append(MAIN_COLUMNS)
+    for item_number, row in enumerate(main_rows, start=1):
+        sheet.append([item_number] + row)
+
+    if struct_rows:
+        sheet = workbook.create_sheet('Struct')
+        sheet.append(STRUCT_COLUMNS)
+        for row in struct_rows:
+            sheet.append(row)
+
+    if csop_rows:
+        sheet = workbook.create_sheet('CSOperation')
+        sheet.append(CSOP_COLUMNS)
+        for row in csop_rows:
+            sheet.append(row)
+
+    workbook.save(excel_file)
+    print(f"Generated Excel file: {excel_file} ({len(main_rows)} port rows, "
+          f"{len(struct_rows)} struct members, {len(csop_rows)} operation arguments)")
+
+
+def convert_arxml_to_xlsx(arxml_file, excel_file):
+    """
+    主函数
+    """
+    parsed = parse_arxml(arxml_file)
+    main_rows, struct_rows, csop_rows = build_sheet_rows(parsed)
+    write_workbook(excel_file, main_rows, struct_rows, csop_rows)
+    return excel_file
+
+
+if __name__ == "__main__":
+    local_arxml_file = sys.argv[1] if len(sys.argv) > 1 else "api/generated/myswc_gen.arxml"
+    local_excel_file = sys.argv[2] if len(sys.argv) > 2 else "myswc_from_arxml.xlsx"
+    convert_arxml_to_xlsx(local_arxml_file, local_excel_file)
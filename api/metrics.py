@@ -0,0 +1,260 @@
+"""
+Metrics
+轻量的 Prometheus 文本格式指标（计数器、仪表、直方图），热路径上只有一次加锁的字典更新
+多进程部署（api.server）时设置 METRICS_DIR：各 worker 定期把快照写入该目录，/api/metrics（/metrics）合并所有存活进程的快照
+"""
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+
+METRICS_DIR = os.getenv('METRICS_DIR')
+# 快照写出间隔（秒）
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    metric_type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def snapshot(self):
+        """{ 标签值元组: 值 }"""
+        with self._lock:
+            return {labels: self._copy(value) for labels, value in self._values.items()}
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+    @staticmethod
+    def merge(left, right):
+        return left + right
+
+    def render(self, samples):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for labels in sorted(samples):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(samples[labels])}")
+        return lines
+
+
+class Counter(_Metric):
+    metric_type = 'counter'
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+
+class Gauge(_Metric):
+    metric_type = 'gauge'
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def dec(self, *labelvalues, amount=1):
+        self.inc(*labelvalues, amount=-amount)
+
+    @contextmanager
+    def track_inprogress(self, *labelvalues):
+        self.inc(*labelvalues)
+        try:
+            yield
+        finally:
+            self.dec(*labelvalues)
+
+
+class CallbackCounter(_Metric):
+    """
+    抓取时从回调读取的计数器（例如模块内已有的统计字典），热路径零开销
+    callback() 返回 { 标签值元组: 值 }
+    """
+    metric_type = 'counter'
+
+    def __init__(self, name, documentation, labelnames, callback):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def snapshot(self):
+        return dict(self.callback())
+
+
+class Histogram(_Metric):
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            if entry is None:
+                # [各桶（非累计）计数..., +Inf 桶计数, 总和]
+                entry = self._values[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+            entry[index] += 1
+            entry[-1] += value
+
+    @contextmanager
+    def time(self, *labelvalues):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labelvalues)
+
+    @staticmethod
+    def _copy(value):
+        return list(value)
+
+    @staticmethod
+    def merge(left, right):
+        return [a + b for a, b in zip(left, right)]
+
+    def render(self, samples):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for labels in sorted(samples):
+            entry = samples[labels]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), entry[:-1]):
+                cumulative += count
+                le = ('le', _format_value(bound) if bound == float('inf') else str(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(entry[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+REGISTRY = []
+
+
+def collect():
+    """当前进程的全部指标快照 { 指标名: { 标签值元组: 值 } }"""
+    return {metric.name: metric.snapshot() for metric in REGISTRY}
+
+
+def _snapshot_path(pid):
+    return os.path.join(METRICS_DIR, f"metrics_{pid}.json")
+
+
+def write_snapshot():
+    """将当前进程的快照写入 METRICS_DIR（先写临时文件再替换，避免读到半个文件）"""
+    data = {name: [[list(labels), value] for labels, value in samples.items()]
+            for name, samples in collect().items()}
+    path = _snapshot_path(os.getpid())
+    with open(path + '.tmp', 'w', encoding='utf-8') as fh:
+        json.dump(data, fh)
+    os.replace(path + '.tmp', path)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _collect_all():
+    """合并 METRICS_DIR 中所有存活进程的快照（已退出进程的快照文件会被删除）"""
+    write_snapshot()
+    merged = {}
+    metrics = {metric.name: metric for metric in REGISTRY}
+    for file_name in os.listdir(METRICS_DIR):
+        if not (file_name.startswith('metrics_') and file_name.endswith('.json')):
+            continue
+        pid = int(file_name[len('metrics_'):-len('.json')])
+        path = os.path.join(METRICS_DIR, file_name)
+        if not _pid_alive(pid):
+            os.remove(path)
+            continue
+        try:
+            with open(path, encoding='utf-8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        for name, samples in data.items():
+            metric = metrics.get(name)
+            if metric is None:
+                continue
+            target = merged.setdefault(name, {})
+            for labels, value in samples:
+                labels = tuple(labels)
+                target[labels] = metric.merge(target[labels], value) if labels in target else value
+    return merged
+
+
+def render_metrics():
+    """生成 Prometheus 文本格式的全部指标"""
+    samples = _collect_all() if METRICS_DIR else collect()
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render(samples.get(metric.name, {})))
+    return '\n'.join(lines) + '\n'
+
+
+_writer_pid = None
+
+
+def start_snapshot_writer():
+    """设置了 METRICS_DIR 时，在当前进程启动定期写快照的后台线程（每个进程只启动一次）"""
+    global _writer_pid
+    if not METRICS_DIR or _writer_pid == os.getpid():
+        return
+    _writer_pid = os.getpid()
+    os.makedirs(METRICS_DIR, exist_ok=True)
+
+    def run():
+        while True:
+            time.sleep(METRICS_FLUSH_INTERVAL)
+            try:
+                write_snapshot()
+            except OSError as e:
+                print(f"Failed to write metrics snapshot: {e}")
+
+    threading.Thread(target=run, name='metrics-snapshot-writer', daemon=True).start()
+
+
+# ========== 转换服务指标 ==========
+HTTP_REQUESTS = Counter('swc_http_requests_total', "HTTP requests by route, method and status",
+                        ('route', 'method', 'status'))
+HTTP_LATENCY = Histogram('swc_http_request_duration_seconds', "HTTP request latency by route", ('route',))
+CONVERSION_STAGE = Histogram('swc_conversion_stage_duration_seconds', "Conversion stage durations", ('stage',))
+CONVERSIONS_IN_FLIGHT = Gauge('swc_conversions_in_flight', "Conversions currently running")
+CONVERSION_QUEUE_WAIT = Histogram('swc_conversion_queue_wait_seconds', "Time spent waiting for a conversion slot")
+WORKBOOK_SIZE = Histogram('swc_workbook_size', "Workbook size by dimension (rows, ports, structs)",
+                          ('dimension',), buckets=SIZE_BUCKETS)
+DB_LATENCY = Histogram('swc_db_call_duration_seconds', "PostgreSQL call latency", ('operation',))
+REDIS_LATENCY = Histogram('swc_redis_call_duration_seconds', "Redis call latency", ('operation',))
+USAGE_LOG_DROPPED = Counter('swc_usage_log_dropped_total', "Usage log events dropped by reason", ('reason',))
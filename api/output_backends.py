@@ -0,0 +1,117 @@
+"""
+Output Backends
+同一份解析模型驱动多个输出后端（ARXML、RTE C代码），一次解析生成全部输出并打包为zip
+"""
+import os
+import hashlib
+import shutil
+import tempfile
+import zipfile
+from api.swc_generator import build_swc_model, canonicalize_model, write_arxml, write_split_arxml
+from api.rte_generator import write_rte_sources
+
+
+def _arxml_backend(model, dest_dir):
+    """
+    ARXML 输出后端（model['split'] 为 'package'/'swc' 时拆分为多个文件）
+    """
+    canonical = model.get('canonical', False)
+    split = model.get('split')
+    # write_arxml/write_split_arxml 会把相对路径放到 api/generated 下，这里统一为绝对路径
+    dest_dir = os.path.abspath(dest_dir)
+    if split:
+        paths = list(write_split_arxml(model, dest_dir, split, canonical))
+        if canonical:
+            paths.append(os.path.join(dest_dir, "SHA256SUMS"))
+        return paths
+
+    os.makedirs(dest_dir, exist_ok=True)
+    output_file = os.path.join(dest_dir, f"{model['swc_name'] or 'result'}.arxml")
+    write_arxml(model, output_file, canonical)
+    if canonical:
+        return [output_file, output_file + '.sha256']
+    return [output_file]
+
+
+# 后端名称 -> 函数(model, dest_dir) -> 生成的文件路径列表
+OUTPUT_BACKENDS = {
+    'arxml': _arxml_backend,
+    'rte': write_rte_sources
+}
+
+
+def register_output_backend(name, backend):
+    """
+    注册自定义输出后端
+    """
+    OUTPUT_BACKENDS[name] = backend
+
+
+def parse_backend_names(value):
+    """
+    解析逗号分隔的后端列表，例如 "arxml,rte"
+    """
+    if not value:
+        return ['arxml']
+    names = [name.strip().lower() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in OUTPUT_BACKENDS]
+    if unknown:
+        raise ValueError(f"Unknown output backend(s): {unknown}")
+    return names
+
+
+def run_backends(model, dest_dir, backends=None):
+    """
+    在同一份模型上依次运行各输出后端
+    返回生成的文件路径列表
+    """
+    paths = []
+    for name in backends or ['arxml']:
+        paths.extend(OUTPUT_BACKENDS[name](model, dest_dir))
+    return paths
+
+
+def write_bundle(model, bundle_path, backends=None, canonical=False, split=None):
+    """
+    在已解析的模型上运行全部指定后端并将结果打包为zip
+    split 为 'package'/'swc' 时ARXML拆分为多个文件
+    canonical=True 时ARXML规范化输出，zip条目按名称排序并使用固定时间戳，返回zip内容的 SHA-256 摘要
+    否则返回 bundle_path
+    """
+    model['canonical'] = canonical
+    model['split'] = split
+    if canonical:
+        canonicalize_model(model)
+
+    work_dir = tempfile.mkdtemp(prefix='swc_bundle_')
+    try:
+        paths = run_backends(model, work_dir, backends or list(OUTPUT_BACKENDS))
+        names = sorted(os.path.relpath(path, work_dir) for path in paths)
+        with zipfile.ZipFile(bundle_path, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+            for name in names:
+                if canonical:
+                    info = zipfile.ZipInfo(name.replace(os.sep, '/'), date_time=(1980, 1, 1, 0, 0, 0))
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    with open(os.path.join(work_dir, name), 'rb') as fh:
+                        bundle.writestr(info, fh.read())
+                else:
+                    bundle.write(os.path.join(work_dir, name), name)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"Generated bundle: {bundle_path}")
+    if canonical:
+        with open(bundle_path, 'rb') as fh:
+            return hashlib.sha256(fh.read()).hexdigest()
+    return bundle_path
+
+
+def convert_xlsx_to_bundle(excel_file, bundle_path, backends=None, canonical=False, split=None):
+    """
+    解析一次Excel，运行全部指定后端并将结果打包为zip（见 write_bundle）
+    Excel读取失败时返回 None
+    """
+    model = build_swc_model(excel_file)
+    if model is None:
+        return None
+    return write_bundle(model, bundle_path, backends, canonical, split)
@@ -0,0 +1,157 @@
+"""
+Profiling
+按需对单次转换做 cProfile + tracemalloc 采样，报告按服务端生成的报告ID保存，未触发的请求不受影响
+
+触发方式：
+    1. 请求头 X-Profile-Token 与环境变量 PROFILE_ADMIN_TOKEN 一致
+    2. 按 PROFILE_SAMPLE_RATE（0~1）随机采样
+    3. 命令行：python -m api.profiling myswcautosar.xlsx [--split package] [--canonical]
+报告保存在 PROFILE_DIR：<report_id>.prof（可用 snakeviz / pstats 查看）与 <report_id>.txt（摘要），
+报告ID = 随机前缀 + 请求ID，由响应头 X-Profile-Report 返回
+tracemalloc 是进程级的，多线程 worker 中会拖慢并混入其他请求线程的内存分配，
+此时（见 set_memory_tracing）只采样 CPU，报告中不含内存部分
+"""
+import io
+import os
+import hmac
+import time
+import random
+import pstats
+import argparse
+import cProfile
+import tempfile
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'swc_profiles'))
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+PROFILE_ADMIN_TOKEN = os.getenv('PROFILE_ADMIN_TOKEN')
+PROFILE_HEADER = 'X-Profile-Token'
+
+# 报告中列出的函数数与内存分配位置数
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+TRACEMALLOC_FRAMES = 10
+
+# 阶段摘要：(阶段名, 入口函数名)，按累计耗时汇总（同一阶段的入口函数互不嵌套）
+STAGE_FUNCTIONS = [
+    ('excel parsing (pandas)', ('read_excel_data',)),
+    ('model construction (autosar, incl. parsing)', ('build_swc_model',)),
+    ('XML writing', ('render_arxml', 'write_arxml', 'write_split_arxml')),
+    ('RTE C generation', ('write_rte_sources',))
+]
+
+# cProfile 与 tracemalloc 都是进程级的，同一时刻只采样一个转换
+_profile_lock = threading.Lock()
+# 是否在采样中使用 tracemalloc，由 api.server 按 worker 线程数设置
+_memory_tracing = {'enabled': True}
+
+
+def set_memory_tracing(enabled):
+    """开启/关闭采样中的内存追踪（同一进程并发处理多个请求时应关闭）"""
+    _memory_tracing['enabled'] = enabled
+
+
+def should_profile(headers):
+    """根据管理员请求头或采样率决定是否采样本次请求"""
+    token = headers.get(PROFILE_HEADER)
+    if PROFILE_ADMIN_TOKEN and token and hmac.compare_digest(token.encode('utf-8'),
+                                                             PROFILE_ADMIN_TOKEN.encode('utf-8')):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def _stage_summary(stats):
+    """从 cProfile 统计中取出各阶段函数的累计耗时"""
+    lines = []
+    for stage, func_names in STAGE_FUNCTIONS:
+        cumulative = sum(ct for (_, _, name), (_, _, _, ct, _) in stats.stats.items() if name in func_names)
+        if cumulative:
+            lines.append(f"  {stage:<44} {cumulative:8.3f} s")
+    return lines
+
+
+def _write_report(report_id, profiler, snapshot, peak_bytes, elapsed):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    base = os.path.join(PROFILE_DIR, report_id)
+    profiler.dump_stats(base + '.prof')
+
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    out.write(f"Profile report: {report_id}\n")
+    if snapshot is None:
+        out.write(f"Wall time: {elapsed:.3f} s, memory not traced (multi-threaded worker)\n\n")
+    else:
+        out.write(f"Wall time: {elapsed:.3f} s, peak traced memory: {peak_bytes / 1024 / 1024:.1f} MB\n\n")
+    out.write("Stages (cumulative):\n")
+    out.write('\n'.join(_stage_summary(stats)) + '\n\n')
+    stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+
+    if snapshot is not None:
+        out.write(f"Top {TOP_ALLOCATIONS} allocations by line:\n")
+        for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]:
+            out.write(f"  {stat}\n")
+
+    with open(base + '.txt', 'w', encoding='utf-8') as fh:
+        fh.write(out.getvalue())
+    print(f"Profile report written: {base}.txt")
+    return base + '.txt'
+
+
+@contextmanager
+def profile_conversion(report_id):
+    """
+    采样代码块的 CPU（cProfile）与内存（tracemalloc）开销，结束后写出报告
+    已有其他转换正在采样时直接执行，不做采样；yield 是否实际采样
+    内存追踪被关闭时只采样 CPU
+    """
+    if not _profile_lock.acquire(blocking=False):
+        yield False
+        return
+    trace_memory = _memory_tracing['enabled']
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    if trace_memory:
+        tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield True
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+        snapshot, peak_bytes = None, 0
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak_bytes = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+        try:
+            _write_report(report_id, profiler, snapshot, peak_bytes, elapsed)
+        except OSError as e:
+            print(f"Failed to write profile report {report_id}: {e}")
+        finally:
+            _profile_lock.release()
+
+
+def main(argv=None):
+    from api.swc_generator import convert_xlsx_to_arxml
+
+    parser = argparse.ArgumentParser(description="Profile one xlsx -> ARXML conversion")
+    parser.add_argument('excel_file')
+    parser.add_argument('--output', default='myswc_gen.arxml')
+    parser.add_argument('--split', choices=['package', 'swc'])
+    parser.add_argument('--canonical', action='store_true')
+    parser.add_argument('--report-id', default=None)
+    args = parser.parse_args(argv)
+
+    report_id = args.report_id or f"cli_{time.strftime('%Y%m%d_%H%M%S')}"
+    with profile_conversion(report_id):
+        convert_xlsx_to_arxml(args.excel_file, args.output, args.canonical, args.split)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""
+Rate Limiting
+按 IP / 激活码的令牌桶限流，以及全局并发转换数的准入控制（带有界等待队列）
+优先使用 Redis（多实例共享），Redis 不可用时退化为进程内实现
+"""
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+import redis
+from api.metrics import REDIS_LATENCY
+
+# 令牌桶：每分钟补充的令牌数与桶容量（允许的突发请求数）
+IP_RATE_PER_MIN = float(os.getenv('RATE_LIMIT_IP_PER_MIN', 10))
+IP_BURST = int(os.getenv('RATE_LIMIT_IP_BURST', 5))
+CODE_RATE_PER_MIN = float(os.getenv('RATE_LIMIT_CODE_PER_MIN', 10))
+CODE_BURST = int(os.getenv('RATE_LIMIT_CODE_BURST', 5))
+
+# 并发转换上限、等待队列长度、排队超时（秒）
+MAX_CONCURRENT_CONVERSIONS = int(os.getenv('MAX_CONCURRENT_CONVERSIONS', os.cpu_count() or 2))
+MAX_QUEUED_CONVERSIONS = int(os.getenv('MAX_QUEUED_CONVERSIONS', 8))
+QUEUE_TIMEOUT = float(os.getenv('CONVERSION_QUEUE_TIMEOUT', 10))
+# Redis 中并发租约的有效期（秒），防止进程异常退出后名额泄漏
+SLOT_LEASE_SECONDS = 300
+# 进程内降级时每个限流器最多保留的桶数，超出时淘汰最久未访问的桶（被淘汰的客户端令牌重新回满）
+LOCAL_BUCKET_LIMIT = 10000
+QUEUE_POLL_INTERVAL = 0.1
+
+# KEYS[1]=桶; ARGV: 每秒速率, 容量, 当前时间 -> {是否允许, 剩余令牌}
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+# KEYS[1]=租约集合; ARGV: 当前时间, 租约有效期, 上限, 租约ID -> 1 获取成功 / 0 已满
+ACQUIRE_SLOT_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', tonumber(ARGV[1]) - tonumber(ARGV[2]))
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+    return 1
+end
+return 0
+"""
+
+
+class RateLimiter:
+    """
+    令牌桶限流器
+    allow(key) 返回 (是否允许, 建议的重试等待秒数)
+    """
+
+    def __init__(self, redis_client, prefix, rate_per_min, burst):
+        self.redis_client = redis_client
+        self.prefix = prefix
+        self.rate = rate_per_min / 60.0
+        self.burst = burst
+        self._script = redis_client.register_script(TOKEN_BUCKET_SCRIPT) if redis_client else None
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        now = time.time()
+        if self._script is not None:
+            try:
+                # 只统计实际的 Redis 往返，进程内降级不计入 Redis 延迟
+                with REDIS_LATENCY.time('rate_limit'):
+                    allowed, tokens = self._script(keys=[f"{self.prefix}:{key}"],
+                                                   args=[self.rate, self.burst, now])
+                return bool(allowed), self._retry_after(float(tokens))
+            except redis.RedisError:
+                pass
+        return self._allow_local(key, now)
+
+    def _allow_local(self, key, now):
+        with self._lock:
+            tokens, ts = self._local.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - ts) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            # 重新插入到末尾：OrderedDict 按最近访问排序，超出上限时淘汰头部（O(1)）
+            self._local[key] = (tokens, now)
+            if len(self._local) > LOCAL_BUCKET_LIMIT:
+                self._local.popitem(last=False)
+        return allowed, self._retry_after(tokens)
+
+    def _retry_after(self, tokens):
+        if tokens >= 1:
+            return 0
+        return int((1 - tokens) / self.rate) + 1
+
+
+class ConcurrencyLimiter:
+    """
+    全局并发转换数准入控制
+    acquire() 名额已满时排队等待（最多 max_queued 个请求，最长 timeout 秒），
+    队列已满或超时返回 None，成功时返回租约，用完后调用 release(lease)
+    """
+
+    def __init__(self, redis_client, key, max_concurrent, max_queued, timeout):
+        self.redis_client = redis_client
+        self.key = key
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self._script = redis_client.register_script(ACQUIRE_SLOT_SCRIPT) if redis_client else None
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self._script is not None:
+            try:
+                return self._acquire_redis()
+            except redis.RedisError:
+                pass
+        return self._acquire_local()
+
+    def release(self, lease):
+        if lease is None:
+            return
+        if lease == 'local':
+            self._semaphore.release()
+            return
+        try:
+            self.redis_client.zrem(self.key, lease)
+        except redis.RedisError:
+            pass
+
+    def _try_acquire_redis(self, lease):
+        return self._script(keys=[self.key],
+                            args=[time.time(), SLOT_LEASE_SECONDS, self.max_concurrent, lease]) == 1
+
+    def _acquire_redis(self):
+        lease = uuid.uuid4().hex
+        if self._try_acquire_redis(lease):
+            return lease
+
+        waiting_key = f"{self.key}:waiting"
+        waiting = self.redis_client.incr(waiting_key)
+        self.redis_client.expire(waiting_key, int(self.timeout) + 60)
+        try:
+            if waiting > self.max_queued:
+                return None
+            deadline = time.time() + self.timeout
+            while time.time() < deadline:
+                time.sleep(QUEUE_POLL_INTERVAL)
+                if self._try_acquire_redis(lease):
+                    return lease
+            return None
+        finally:
+            self.redis_client.decr(waiting_key)
+
+    def _acquire_local(self):
+        if self._semaphore.acquire(blocking=False):
+            return 'local'
+
+        with self._lock:
+            if self._waiting >= self.max_queued:
+                return None
+            self._waiting += 1
+        try:
+            if self._semaphore.acquire(timeout=self.timeout):
+                return 'local'
+            return None
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+
+def create_limiters(redis_client):
+    """
+    创建 IP 限流器、激活码限流器与并发准入控制器
+    """
+    return (RateLimiter(redis_client, 'rate:ip', IP_RATE_PER_MIN, IP_BURST),
+            RateLimiter(redis_client, 'rate:code', CODE_RATE_PER_MIN, CODE_BURST),
+            ConcurrencyLimiter(redis_client, 'conversions:inflight', MAX_CONCURRENT_CONVERSIONS,
+                               MAX_QUEUED_CONVERSIONS, QUEUE_TIMEOUT))
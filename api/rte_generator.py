@@ -0,0 +1,267 @@
+"""
+RTE C Code Generator
+根据 build_swc_model 解析出的同一份模型生成 C 代码骨架：
+Rte_Type.h（类型头文件）、Rte_<SWC>.h（RTE API 声明）、<SWC>.c（runnable 桩代码）
+"""
+import os
+import cfile
+import autosar.xml.enumeration as ar_enum
+from api.swc_generator import parse_type_name, resolve_struct_order
+
+C = cfile.CFactory()
+
+
+def _type_name(type_ref):
+    """
+    从实现数据类型引用中取出类型名
+    """
+    return str(type_ref).rsplit('/', 1)[-1]
+
+
+def _by_reference(model, type_name):
+    """结构体与数组类型按指针传递"""
+    return type_name in model['struct_defs'] or any(name == type_name for name, _, _ in model['array_types'])
+
+
+def _data_param(model, type_name, name, writable):
+    """
+    生成参数：结构体按指针传递，输出参数按指针传递，其余按值传递
+    """
+    if writable:
+        return C.variable(name, type_name, pointer=True)
+    if _by_reference(model, type_name):
+        return C.variable(name, C.type(type_name, const=True), pointer=True)
+    return C.variable(name, type_name)
+
+
+def _operation_params(model, operation):
+    """
+    根据 operation 的参数方向生成参数列表
+    """
+    params = []
+    for argument in operation.arguments:
+        writable = argument.direction in (ar_enum.ArgumentDirection.OUT, ar_enum.ArgumentDirection.INOUT)
+        params.append(_data_param(model, _type_name(argument.type_ref), argument.name, writable))
+    return params
+
+
+def _find_operation(model, interface_name, operation_name):
+    """从模型的 operation 索引中查找"""
+    operation = model['operations'][interface_name].get(operation_name)
+    if operation is None:
+        raise ValueError(f"Operation '{operation_name}' not found in interface '{interface_name}'")
+    return operation
+
+
+def _sr_element(model, port):
+    """
+    返回 SR 端口对应的 (element_name, type_name)
+    """
+    interface = model['interfaces'][port['interface_name']]
+    data_element = interface.data_elements[0]
+    return data_element.name, _type_name(data_element.type_ref)
+
+
+def _sr_api_name(port, element_name):
+    prefix = 'Rte_Write' if port['direction'].lower() == 'provide' else 'Rte_Read'
+    return f"{prefix}_{port['port_name']}_{element_name}"
+
+
+def _client_calls(model):
+    """
+    收集 require 方向 CS 端口的 Rte_Call 信息
+    返回: [ (api_name, operation), ... ]
+    """
+    calls = []
+    for port_name, info in model['cs_ports'].items():
+        if info['direction'].lower() != 'require':
+            continue
+        for operation_name in dict.fromkeys(info['operations']):
+            calls.append((f"Rte_Call_{port_name}_{operation_name}",
+                          _find_operation(model, info['interface_name'], operation_name)))
+    return calls
+
+
+def _server_runnables(model):
+    """
+    收集 provide 方向 CS 端口的 server runnable 信息（同名 runnable 只保留一个）
+    返回: [ (runnable_name, operation), ... ]
+    """
+    runnables = {}
+    for runnable in model['runnables']:
+        if runnable['kind'] != 'operation' or runnable['name'] in runnables:
+            continue
+        info = model['cs_ports'][runnable['port_name']]
+        runnables[runnable['name']] = _find_operation(model, info['interface_name'], runnable['operation_name'])
+    return list(runnables.items())
+
+
+def _include_guard_begin(code, guard):
+    code.append(C.ifndef(guard))
+    code.append(C.define(guard))
+    code.append(C.blank())
+
+
+def gen_type_header(model):
+    """
+    生成 Rte_Type.h 内容：按依赖顺序输出结构体类型定义，之后输出数组类型定义
+    基本类型来自 Std_Types.h（Platform_Types）
+    """
+    guard = "RTE_TYPE_H_"
+    code = C.sequence()
+    _include_guard_begin(code, guard)
+    code.append(C.include("Std_Types.h"))
+    code.append(C.blank())
+
+    struct_defs = model['struct_defs']
+    if struct_defs:
+        for struct_name in resolve_struct_order(struct_defs):
+            members = []
+            for member in struct_defs[struct_name]:
+                member_type, array_size = parse_type_name(member['member_type'])
+                members.append(C.struct_member(member['member_name'], member_type, array=array_size))
+            struct = C.struct("Rte_struct_" + struct_name, members)
+            code.append(C.statement(C.declaration(struct)))
+            code.append(C.statement(C.declaration(C.typedef(struct_name, struct))))
+            code.append(C.blank())
+
+    if model['array_types']:
+        for type_name, base_type, array_size in model['array_types']:
+            code.append(C.statement(C.declaration(C.typedef(type_name, base_type, array=array_size))))
+        code.append(C.blank())
+
+    code.append([C.endif(), C.block_comment(" " + guard + " ")])
+    return cfile.Writer(cfile.StyleOptions()).write_str(code)
+
+
+def gen_rte_header(model):
+    """
+    生成 Rte_<SWC>.h 内容：Rte_Read/Rte_Write/Rte_Call 声明及 runnable 原型
+    """
+    swc_name = model['swc_name']
+    guard = f"RTE_{swc_name.upper()}_H_"
+    code = C.sequence()
+    _include_guard_begin(code, guard)
+    code.append(C.include("Rte_Type.h"))
+    code.append(C.blank())
+
+    for port in model['sr_ports']:
+        element_name, type_name = _sr_element(model, port)
+        writable = port['direction'].lower() == 'require'
+        func = C.function(_sr_api_name(port, element_name), "Std_ReturnType", extern=True,
+                          params=[_data_param(model, type_name, "data", writable)])
+        code.append(C.statement(C.declaration(func)))
+    for api_name, operation in _client_calls(model):
+        func = C.function(api_name, "Std_ReturnType", extern=True,
+                          params=_operation_params(model, operation))
+        code.append(C.statement(C.declaration(func)))
+    code.append(C.blank())
+
+    for runnable in model['runnables']:
+        if runnable['kind'] != 'operation':
+            code.append(C.statement(C.declaration(C.function(runnable['name'], "void", extern=True))))
+    for runnable_name, operation in _server_runnables(model):
+        func = C.function(runnable_name, "Std_ReturnType", extern=True,
+                          params=_operation_params(model, operation))
+        code.append(C.statement(C.declaration(func)))
+    code.append(C.blank())
+
+    code.append([C.endif(), C.block_comment(" " + guard + " ")])
+    return cfile.Writer(cfile.StyleOptions()).write_str(code)
+
+
+def _local_declaration(model, var_name, type_name):
+    """
+    零初始化的局部变量声明：结构体/数组为 {0}，其余为 0（避免 -Wuninitialized）
+    """
+    init_value = [0] if _by_reference(model, type_name) else 0
+    return C.statement(C.declaration(C.variable(var_name, type_name), init_value))
+
+
+def _call_args(model, operation, prefix, declarations):
+    """
+    为 Rte_Call 生成局部变量声明（以 prefix 区分不同调用，追加到 declarations）并返回实参列表
+    """
+    args = []
+    for argument in operation.arguments:
+        type_name = _type_name(argument.type_ref)
+        var_name = f"{prefix}_{argument.name}"
+        declarations.append(_local_declaration(model, var_name, type_name))
+        by_pointer = (argument.direction != ar_enum.ArgumentDirection.IN) or _by_reference(model, type_name)
+        args.append(f"&{var_name}" if by_pointer else var_name)
+    return args
+
+
+def gen_runnable_stubs(model):
+    """
+    生成 <SWC>.c 内容：每个 runnable 一个函数桩，示范 Rte_Read/Rte_Write/Rte_Call 的用法
+    client 调用放在第一个周期 runnable 中（不存在时放在 Init runnable 中）
+    局部变量全部声明在函数体开头（C90/MISRA），并零初始化
+    """
+    swc_name = model['swc_name']
+    code = C.sequence()
+    code.append(C.include(f"Rte_{swc_name}.h"))
+    code.append(C.blank())
+
+    sr_ports = {port['port_name']: port for port in model['sr_ports']}
+    client_runnable = next((r['name'] for r in model['runnables'] if r['kind'] == 'periodic'),
+                           model['runnables'][0]['name'])
+
+    for runnable in model['runnables']:
+        if runnable['kind'] == 'operation':
+            continue
+        code.append(C.declaration(C.function(runnable['name'], "void")))
+        declarations = []
+        calls = []
+        for port in (sr_ports[port_name] for port_name in runnable.get('port_names', [])):
+            element_name, type_name = _sr_element(model, port)
+            var_name = f"{port['port_name']}_{element_name}"
+            declarations.append(_local_declaration(model, var_name, type_name))
+            by_pointer = port['direction'].lower() == 'require' or _by_reference(model, type_name)
+            arg = f"&{var_name}" if by_pointer else var_name
+            calls.append(C.statement(C.func_call(_sr_api_name(port, element_name), arg)))
+        if runnable['name'] == client_runnable:
+            for api_name, operation in _client_calls(model):
+                args = _call_args(model, operation, api_name[len("Rte_Call_"):], declarations)
+                calls.append(C.statement(C.func_call(api_name, args)))
+        body = C.block()
+        for statement in declarations + calls:
+            body.append(statement)
+        code.append(body)
+        code.append(C.blank())
+
+    for runnable_name, operation in _server_runnables(model):
+        func = C.function(runnable_name, "Std_ReturnType", params=_operation_params(model, operation))
+        code.append(C.declaration(func))
+        body = C.block()
+        for argument in operation.arguments:
+            body.append(C.statement(f"(void){argument.name}"))
+        body.append(C.statement(C.func_return("E_OK")))
+        code.append(body)
+        code.append(C.blank())
+
+    return cfile.Writer(cfile.StyleOptions()).write_str(code)
+
+
+def write_rte_sources(model, dest_dir):
+    """
+    将类型头文件、RTE头文件和runnable桩代码写入目标目录
+    返回生成的文件路径列表
+    """
+    if not model['swc_name']:
+        return []
+
+    os.makedirs(dest_dir, exist_ok=True)
+    files = {
+        "Rte_Type.h": gen_type_header(model),
+        f"Rte_{model['swc_name']}.h": gen_rte_header(model),
+        f"{model['swc_name']}.c": gen_runnable_stubs(model)
+    }
+    paths = []
+    for file_name, content in files.items():
+        file_path = os.path.join(dest_dir, file_name)
+        with open(file_path, 'w', encoding='utf-8') as fh:
+            fh.write(content)
+        paths.append(file_path)
+        print(f"Generated C file: {file_path}")
+    return paths
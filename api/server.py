@@ -0,0 +1,145 @@
+"""
+Production Server
+自托管部署的生产入口：主进程预加载 autosar/pandas 并用示例工作簿预热转换路径，
+再 fork 出多个 gunicorn worker（多进程利用多核，每个进程可开多个线程），SIGTERM 时优雅停止
+
+用法：
+    python -m api.server --bind 0.0.0.0:8000 --workers 4 --threads 2
+环境变量：SERVER_BIND、SERVER_WORKERS、SERVER_THREADS、SERVER_TIMEOUT、SERVER_GRACEFUL_TIMEOUT
+多 worker 时设置 METRICS_DIR，/api/metrics 才会汇总所有 worker 的指标（见 api/metrics.py）
+SERVER_DRAIN_SECONDS：worker 收到 SIGTERM 后 /api/readyz 先返回 503 并继续处理请求的秒数，
+让负载均衡有时间摘除实例，须小于 SERVER_GRACEFUL_TIMEOUT
+部署在 nginx 等反向代理之后时设置 TRUSTED_PROXY_COUNT（代理层数），按IP限流才会使用 X-Forwarded-For 中的客户端地址
+"""
+import io
+import os
+import signal
+import argparse
+import threading
+import contextlib
+
+DEFAULT_BIND = os.getenv('SERVER_BIND', '0.0.0.0:8000')
+DEFAULT_WORKERS = int(os.getenv('SERVER_WORKERS', os.cpu_count() or 2))
+DEFAULT_THREADS = int(os.getenv('SERVER_THREADS', 2))
+# 单个请求的最长处理时间、收到停止信号后等待在途请求完成的时间（秒）
+DEFAULT_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 120))
+DEFAULT_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', 30))
+# 收到停止信号后保持服务、仅让 readiness 返回 503 的时间（秒）
+DEFAULT_DRAIN_SECONDS = float(os.getenv('SERVER_DRAIN_SECONDS', 5))
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+WARMUP_WORKBOOK = os.path.join(ROOT_DIR, 'myswcautosar.xlsx')
+
+
+def warm_up():
+    """
+    在 fork 之前导入 autosar/pandas 并完整跑一次转换，
+    让各 worker 通过写时复制共享已加载的模块，第一个请求不再承担导入开销
+    """
+    from api.swc_generator import build_swc_model, render_arxml
+
+    if not os.path.exists(WARMUP_WORKBOOK):
+        print(f"Warm-up workbook not found: {WARMUP_WORKBOOK}")
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = build_swc_model(WARMUP_WORKBOOK)
+        if model is not None:
+            render_arxml(model)
+    print("Warm-up conversion completed")
+
+
+def _post_worker_init(worker, drain_seconds):
+    """
+    按 worker 线程数决定采样时是否追踪内存；
+    worker 收到 SIGTERM 时先将 readiness 置为不可用，继续处理请求 drain_seconds 秒，
+    再交给 gunicorn 的处理函数完成优雅停止（gunicorn 的处理函数会立即让 worker 停止接收请求）
+    drain 期间再次收到 SIGTERM 则立即停止
+    """
+    from api.index import mark_draining
+    from api.profiling import set_memory_tracing
+
+    set_memory_tracing(worker.cfg.threads <= 1)
+    previous = signal.getsignal(signal.SIGTERM)
+    if not callable(previous):
+        return
+    drain_timer = []
+
+    def handle_term(signum, frame):
+        if drain_timer or drain_seconds <= 0:
+            previous(signum, None)
+            return
+        mark_draining()
+        print(f"Worker {os.getpid()} draining for {drain_seconds}s before shutdown")
+        timer = threading.Timer(drain_seconds, previous, args=(signum, None))
+        timer.daemon = True
+        drain_timer.append(timer)
+        timer.start()
+
+    signal.signal(signal.SIGTERM, handle_term)
+
+
+def run_gunicorn(app, bind, workers, threads, timeout, graceful_timeout, drain_seconds):
+    from gunicorn.app.base import BaseApplication
+
+    class StandaloneApplication(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    options = {
+        'bind': bind,
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'timeout': timeout,
+        'graceful_timeout': graceful_timeout,
+        'post_worker_init': lambda worker: _post_worker_init(worker, drain_seconds)
+    }
+    StandaloneApplication(app, options).run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SWC Maker production server")
+    parser.add_argument('--bind', default=DEFAULT_BIND)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--threads', type=int, default=DEFAULT_THREADS)
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT)
+    parser.add_argument('--graceful-timeout', type=int, default=DEFAULT_GRACEFUL_TIMEOUT)
+    parser.add_argument('--drain-seconds', type=float, default=DEFAULT_DRAIN_SECONDS,
+                        help="收到 SIGTERM 后 readiness 返回 503、继续服务的秒数")
+    parser.add_argument('--no-warmup', action='store_true', help="跳过启动时的预热转换")
+    args = parser.parse_args(argv)
+    if args.drain_seconds >= args.graceful_timeout:
+        # drain 结束后还要等在途请求完成，超过 graceful timeout 会被主进程强制结束
+        parser.error("--drain-seconds must be less than --graceful-timeout")
+
+    if not args.no_warmup:
+        warm_up()
+    from api.index import app
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        # gunicorn 不支持 Windows，此时退化为单进程多线程服务器
+        print("gunicorn not available, falling back to threaded single-process server")
+        from api.profiling import set_memory_tracing
+        set_memory_tracing(False)
+        host, _, port = args.bind.rpartition(':')
+        app.run(host=host or '0.0.0.0', port=int(port), threaded=True)
+        return
+
+    print(f"Starting {args.workers} worker(s) x {args.threads} thread(s) on {args.bind}")
+    run_gunicorn(app, args.bind, args.workers, args.threads, args.timeout, args.graceful_timeout,
+                 args.drain_seconds)
+
+
+if __name__ == '__main__':
+    main()
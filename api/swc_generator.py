@@ -3,10 +3,43 @@ AUTOSAR SWC Generator from Excel
 根据Excel文件生成AUTOSAR软件组件描述文件
 """
 import os
+import re
+import bisect
+import hashlib
+import threading
+from collections import OrderedDict
 import pandas as pd
 import autosar
 import autosar.xml.element as ar_element
+import autosar.xml.enumeration as ar_enum
 import autosar.xml.workspace as ar_workspace
+import autosar.xml.document as ar_document
+from autosar.xml.writer import Writer
+
+# 输出文档包含的包（顺序固定）
+ARXML_PACKAGES = ["/PortInterfaces", "/Constants", "/AUTOSAR_Platform", "/ComponentTypes"]
+
+# 拆分输出时共享的平台类型文件
+PLATFORM_FILE = "AUTOSAR_Platform.arxml"
+
+# 平台文档序列化缓存 { (canonical, 结构体定义签名, 数组类型签名): bytes }，平台包内容只由结构体与数组类型决定
+# 键来自用户上传的 Struct sheet，按 LRU 只保留最近 PLATFORM_CACHE_SIZE 个，避免常驻进程内存无限增长
+PLATFORM_CACHE_SIZE = int(os.getenv('PLATFORM_CACHE_SIZE', 4))
+_platform_document_cache = OrderedDict()
+_platform_cache_lock = threading.Lock()
+# 平台文件缓存命中统计（供 /api/metrics 读取）
+platform_cache_stats = {'hits': 0, 'misses': 0}
+
+# 平台类型所在的包（顺序与 create_platform_types 首次添加的顺序一致）
+PLATFORM_PACKAGE_KEYS = ["PlatformBaseTypes", "PlatformDataConstraints", "PlatformCompuMethods",
+                         "PlatformImplementationDataTypes"]
+# 复用的平台类型元素 [(包键, 元素)]，见 cached_platform_elements
+_platform_elements = []
+
+# 规范化输出时排序的 runnable 访问点列表（均为 VariableAccess，按名称排序）
+RUNNABLE_ACCESS_LISTS = ['data_read_access', 'data_receive_point_by_argument', 'data_receive_point_by_value',
+                         'data_send_point', 'data_write_access', 'read_local_variable', 'write_local_variable',
+                         'server_call_point']
 
 
 def create_package_map(workspace: ar_workspace.Workspace):
@@ -109,11 +142,30 @@ def create_platform_types(workspace: ar_workspace.Workspace):
     workspace.add_element("PlatformImplementationDataTypes", float32_impl_type)
 
 
+def cached_platform_elements():
+    """
+    平台类型元素 [(包键, 元素)]，每个进程只创建一次，之后不再修改，供常驻进程（watch）在多次生成之间复用
+    同一元素对象会先后加入多个工作空间（parent 指向最后加入的包），只用于单线程依次生成的场景
+    """
+    if not _platform_elements:
+        staging = autosar.xml.Workspace()
+        create_package_map(staging)
+        create_platform_types(staging)
+        for package_key in PLATFORM_PACKAGE_KEYS:
+            package = staging.package_map[package_key]
+            _platform_elements.extend((package_key, element) for element in list(package.elements))
+    return _platform_elements
+
+
 def create_data_type(workspace: ar_workspace.Workspace, data_type_name: str, struct_types=None):
     """
     根据数据类型名称创建对应的实现数据类型引用
-    支持基本类型和结构体类型
+    支持基本类型、结构体类型以及数组类型（写作 BaseType[N]）
     """
+    base_type, array_size = parse_type_name(data_type_name)
+    if array_size is not None:
+        return create_array_type(workspace, base_type, array_size, struct_types)
+
     data_type_map = {
         'uint8': 'uint8',
         'uint16': 'uint16',
@@ -141,6 +193,44 @@ def create_data_type(workspace: ar_workspace.Workspace, data_type_name: str, str
     return workspace.find_element("PlatformImplementationDataTypes", 'uint8')
 
 
+def create_array_type(workspace: ar_workspace.Workspace, base_type: str, array_size: int, struct_types=None):
+    """
+    创建（或复用已创建的）定长 ARRAY 实现数据类型，名称为 <BaseType>_Arr<N>
+    数组元素以基础类型命名，RTE 代码生成据此还原 (基础类型, 长度)
+    """
+    type_name = array_type_name(base_type, array_size)
+    existing = workspace.find_element("PlatformImplementationDataTypes", type_name)
+    if existing is not None:
+        return existing
+
+    element_type = create_data_type(workspace, base_type, struct_types)
+    sw_data_def_props = ar_element.SwDataDefPropsConditional(impl_data_type_ref=element_type.ref())
+    array_element = ar_element.ImplementationDataTypeElement(
+        element_type.name,
+        category="TYPE_REFERENCE",
+        array_size=array_size,
+        array_size_semantics=ar_enum.ArraySizeSemantics.FIXED_SIZE,
+        sw_data_def_props=sw_data_def_props
+    )
+    array_type = ar_element.ImplementationDataType(type_name, category="ARRAY", sub_elements=[array_element])
+    workspace.add_element("PlatformImplementationDataTypes", array_type)
+    print(f"Created ARRAY type: {type_name}")
+    return array_type
+
+
+def collect_array_types(workspace: ar_workspace.Workspace):
+    """
+    收集工作空间中的数组类型
+    返回: [ (type_name, base_type, array_size), ... ]
+    """
+    array_types = []
+    for element in workspace.package_map["PlatformImplementationDataTypes"].elements:
+        if element.category == "ARRAY":
+            array_element = element.sub_elements[0]
+            array_types.append((element.name, array_element.name, array_element.array_size))
+    return array_types
+
+
 def create_senderreceiver_interface(workspace: ar_workspace.Workspace, interface_name: str, element_name: str, data_type: str, struct_types=None):
     """
     创建发送接收接口
@@ -163,32 +253,17 @@ def create_senderreceiver_interface(workspace: ar_workspace.Workspace, interface
     
     return port_interface
 
-def create_clientserver_interface(workspace: ar_workspace.Workspace, interface_name: str, operation_name: str, data_type: str, struct_types=None, csop_defs=None):
+def _create_operation_arguments(workspace: ar_workspace.Workspace, operation, interface_name: str,
+                                data_type: str, struct_types=None, csop_defs=None):
     """
-    创建ClientServer接口
-    如果接口已存在，则向其添加新的operation
+    为operation创建参数
     当 csop_defs 中有 (interface_name, operation_name) 的自定义参数时使用自定义参数，
     否则使用固定的 invalue/outvalue（向后兼容）
     """
-    import autosar.xml.enumeration as ar_enum
-
-    # 检查接口是否已存在
-    existing_interface = workspace.find_element("PortInterfaces", interface_name)
-
-    if existing_interface is not None:
-        # 接口已存在，添加新的operation
-        portinterface = existing_interface
-    else:
-        # 创建新的ClientServer接口
-        portinterface = ar_element.ClientServerInterface(interface_name, is_service=False)
-
-    # 创建operation
-    operation = portinterface.create_operation(operation_name)
-
     # 查找是否有自定义参数定义
     custom_args = None
     if csop_defs:
-        custom_args = csop_defs.get((interface_name, operation_name))
+        custom_args = csop_defs.get((interface_name, operation.name))
 
     if custom_args:
         # 使用自定义参数
@@ -227,6 +302,29 @@ def create_clientserver_interface(workspace: ar_workspace.Workspace, interface_n
                                     ar_enum.ServerArgImplPolicy.USE_ARGUMENT_TYPE,
                                     type_ref=impl_type.ref())
 
+
+def create_clientserver_interface(workspace: ar_workspace.Workspace, interface_name: str, operations: list,
+                                  struct_types=None, csop_defs=None):
+    """
+    一次性创建ClientServer接口及其全部operation
+    operations: 该接口按行分组后的 [ {element_name, data_type}, ... ]，element_name 即operation名
+    如果接口已存在，则向其添加新的operation
+    """
+    # 检查接口是否已存在（每个接口只查找一次）
+    existing_interface = workspace.find_element("PortInterfaces", interface_name)
+
+    if existing_interface is not None:
+        # 接口已存在，添加新的operation
+        portinterface = existing_interface
+    else:
+        # 创建新的ClientServer接口
+        portinterface = ar_element.ClientServerInterface(interface_name, is_service=False)
+
+    for elem in operations:
+        operation = portinterface.create_operation(elem['element_name'])
+        _create_operation_arguments(workspace, operation, interface_name, elem['data_type'],
+                                    struct_types, csop_defs)
+
     # 如果是新创建的接口，添加到工作空间
     if existing_interface is None:
         workspace.add_element("PortInterfaces", portinterface)
@@ -234,6 +332,16 @@ def create_clientserver_interface(workspace: ar_workspace.Workspace, interface_n
     return portinterface
 
 
+def index_operations(interface):
+    """
+    建立 { operation名: operation } 索引（同名时取第一个，与按顺序查找的结果一致）
+    """
+    operations = {}
+    for operation in interface.operations:
+        operations.setdefault(operation.name, operation)
+    return operations
+
+
 def create_port(swc: ar_element.ApplicationSoftwareComponentType, port_name: str, interface_ref, 
                 direction: str, init_value_ref=None):
     """
@@ -253,25 +361,21 @@ def create_port(swc: ar_element.ApplicationSoftwareComponentType, port_name: str
 
 
 def create_clientserver_port(swc: ar_element.ApplicationSoftwareComponentType, port_name: str,
-                             interface_ref, direction: str, operation_names):
+                             interface_ref, direction: str, operation_names, operation_index=None):
     """
     创建ClientServer类型的端口（提供端口或需求端口）
-    支持单个或多个operation
+    支持单个或多个operation；operation_index 为接口的 { operation名: operation }，未提供时现建
     """
     if isinstance(operation_names, str):
         operation_names = [operation_names]
 
     interface = interface_ref
+    if operation_index is None:
+        operation_index = index_operations(interface)
     com_specs = []
 
     for operation_name in operation_names:
-        operation = None
-        if hasattr(interface, 'operations') and interface.operations:
-            for op in interface.operations:
-                if op.name == operation_name:
-                    operation = op
-                    break
-
+        operation = operation_index.get(operation_name)
         if operation is None:
             raise ValueError(f"Operation '{operation_name}' not found in interface '{interface.name}'")
 
@@ -292,13 +396,72 @@ def create_clientserver_port(swc: ar_element.ApplicationSoftwareComponentType, p
         return swc.create_require_port(port_name, interface_ref, com_spec=com_specs)
 
 
-def create_runnable(behavior, runnable_name: str, port_names: list):
+# 事件名后缀序号（<name>_<N>，与库函数一样只要求以数字开头）
+EVENT_INDEX_PATTERN = re.compile(r'(\d+)')
+
+
+class EventNameIndex:
+    """
+    事件名唯一化的索引版本，命名规则与 autosar 库的 make_unique_name_in_list 完全一致：
+    已有同名事件时把它改名为 <name>_0，新事件取 <name>_<最大序号+1>
+    库函数每次都对全部事件做正则匹配（事件数的平方复杂度），这里用有序名称表只检查前缀相同的事件
+    """
+
+    def __init__(self, events):
+        self.events = {event.name: event for event in events}
+        self.names = sorted(self.events)
+
+    def _add(self, name, event):
+        self.events[name] = event
+        bisect.insort(self.names, name)
+
+    def unique_name(self, base_name):
+        prefix = base_name + '_'
+        index = bisect.bisect_left(self.names, prefix)
+        has_index = False
+        highest_index = 0
+        while index < len(self.names) and self.names[index].startswith(prefix):
+            result = EVENT_INDEX_PATTERN.match(self.names[index], len(prefix))
+            if result is not None:
+                has_index = True
+                highest_index = max(highest_index, int(result.group(1)))
+            index += 1
+
+        unpatched_event = self.events.pop(base_name, None)
+        if unpatched_event is not None:
+            self.names.remove(base_name)
+            unpatched_event.name = prefix + '0'
+            self._add(unpatched_event.name, unpatched_event)
+        if has_index or unpatched_event is not None:
+            return prefix + str(highest_index + 1)
+        return base_name
+
+    def append(self, behavior, event):
+        behavior.append_event(event)
+        self._add(event.name, event)
+
+
+def create_operation_invoked_event(behavior, event_names: EventNameIndex, runnable, port, operation):
+    """
+    创建OperationInvokedEvent（与 behavior.create_operation_invoked_event 生成的事件相同），
+    runnable/port/operation 直接传入对象，不再按名称逐个查找
+    """
+    prefix = behavior.get_valid_behavior_settings().operation_invoked_event_prefix
+    event_name = event_names.unique_name("_".join([prefix, runnable.name, port.name, operation.name]))
+    event = ar_element.OperationInvokedEvent.make(event_name, runnable.ref(), port.ref(), operation.ref())
+    event_names.append(behavior, event)
+    return event
+
+
+def create_runnable(behavior, runnable_name: str, port_names: list,
+                    can_be_invoked_concurrently=False, exclusive_area=None):
     """
     创建可运行实体
     """
     runnable = behavior.create_runnable(runnable_name,
-                                        can_be_invoked_concurrently=False,
-                                        minimum_start_interval=0)
+                                        can_be_invoked_concurrently=can_be_invoked_concurrently,
+                                        minimum_start_interval=0,
+                                        can_enter_leave=exclusive_area)
     if port_names:
         runnable.create_port_access(port_names)
     return runnable
@@ -312,36 +475,105 @@ def create_access_points(behavior, port_names: list):
         behavior.create_port_api_options("*", enable_take_address=False, indirect_api=False)
 
 
-def _build_struct_init_value(struct_name, struct_defs):
+def _parse_init_value(value):
     """
-    递归构建结构体的 RecordValueSpecification 初始值
-    每个成员默认为 0
+    将 Struct sheet 中的 InitValue 转为数值（支持 TRUE/FALSE），无法转换时抛出 ValueError
     """
-    members = struct_defs[struct_name]
-    fields = []
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        number = float(value)
+    else:
+        text = str(value).strip().upper()
+        if text in ('TRUE', 'FALSE'):
+            return int(text == 'TRUE')
+        number = float(text)
+    return int(number) if number.is_integer() else number
 
-    for member in members:
-        member_name = member['member_name']
-        member_type = member['member_type']
 
-        if member_type.lower() in PRIMITIVE_TYPES:
-            field = ar_element.NumericalValueSpecification(label=member_name, value=0)
-        elif member_type in struct_defs:
-            field = _build_struct_init_value(member_type, struct_defs)
-        else:
-            field = ar_element.NumericalValueSpecification(label=member_name, value=0)
+def _build_init_value(workspace, type_name, init_value, struct_defs, shared_constants, label=None):
+    """
+    构建单个成员/数组元素的初始值
+    基本类型为数值（默认 0），结构体引用共享初始值常量，数组按长度展开元素
+    """
+    base_type, array_size = parse_type_name(type_name)
+    if array_size is not None:
+        elements = [_build_init_value(workspace, base_type, init_value, struct_defs, shared_constants)
+                    for _ in range(array_size)]
+        return ar_element.ArrayValueSpecification(label=label, elements=elements)
+    if base_type in struct_defs:
+        constant = _shared_init_constant(workspace, base_type, struct_defs, shared_constants)
+        return ar_element.ConstantReference(constant.ref(), label=label)
+    value = _parse_init_value(init_value) if init_value is not None else 0
+    return ar_element.NumericalValueSpecification(label=label, value=value)
+
+
+def _shared_init_constant(workspace, type_name, struct_defs, shared_constants):
+    """
+    获取结构体/数组类型的共享初始值常量（<Type>_IV），同一类型只创建一次
+    结构体成员初始值取自 Struct sheet 的 InitValue 列，嵌套结构体引用其自身的共享常量
+    """
+    base_type, array_size = parse_type_name(type_name)
+    key = (base_type, array_size)
+    if key in shared_constants:
+        return shared_constants[key]
+
+    if array_size is None:
+        fields = [_build_init_value(workspace, member['member_type'], member.get('init_value'),
+                                    struct_defs, shared_constants, label=member['member_name'])
+                  for member in struct_defs[base_type]]
+        value = ar_element.RecordValueSpecification(fields=fields)
+        constant_name = f"{base_type}_IV"
+    else:
+        value = _build_init_value(workspace, type_name, None, struct_defs, shared_constants)
+        constant_name = f"{array_type_name(base_type, array_size)}_IV"
+
+    constant = ar_element.ConstantSpecification(constant_name, value)
+    workspace.add_element("Constants", constant)
+    shared_constants[key] = constant
+    return constant
 
-        fields.append(field)
 
-    return ar_element.RecordValueSpecification(fields=fields)
+def _shared_constant_names(interface_data, struct_defs):
+    """
+    收集可能创建的共享初始值常量名（结构体 <Struct>_IV、数组 <Base>_Arr<N>_IV），
+    用于在创建 element 常量前预留，避免 <Element>_IV 与之重名
+    """
+    type_names = [elem['data_type'] for info in interface_data.values() for elem in info['elements']]
+    type_names += [member['member_type'] for members in struct_defs.values() for member in members]
+    names = {f"{struct_name}_IV" for struct_name in struct_defs}
+    for type_name in type_names:
+        base_type, array_size = parse_type_name(type_name)
+        if array_size is not None:
+            names.add(f"{array_type_name(base_type, array_size)}_IV")
+    return names
+
+
+def _unique_constant_name(base_name, used_names):
+    """base_name 已被占用时追加 _1、_2 ... 后缀，返回的名称会加入 used_names"""
+    name = base_name
+    index = 0
+    while name in used_names:
+        index += 1
+        name = f"{base_name}_{index}"
+    used_names.add(name)
+    return name
 
 
 def create_constants(workspace: ar_workspace.Workspace, interface_data: dict, struct_defs=None):
     """
     创建常量规范（初始值）
     仅为SenderReceiver接口创建常量
-    支持基本类型和结构体类型
+    基本类型每个 element 一个 <Element>_IV 常量；结构体/数组类型的初始值按类型去重，
+    使用同一类型的 element 共同引用一个 <Type>_IV 常量
+    共享常量名预先保留，与之（或彼此）重名的 element 常量追加数字后缀
+    返回: { element_name: ConstantSpecification }
     """
+    struct_defs = struct_defs or {}
+    shared_constants = {}
+    element_constants = {}
+    used_names = _shared_constant_names(interface_data, struct_defs)
+
     for interface_name, info in interface_data.items():
         # ClientServer接口不需要初始值常量
         if info['interface_type'].strip().lower() == 'clientserver':
@@ -349,25 +581,24 @@ def create_constants(workspace: ar_workspace.Workspace, interface_data: dict, st
 
         for elem in info['elements']:
             element_name = elem['element_name']
-            data_type = elem['data_type']
-
-            constant_name = f"{element_name}_IV"
+            base_type, array_size = parse_type_name(elem['data_type'])
 
-            if struct_defs and data_type in struct_defs:
-                # 结构体类型：构建 RecordValueSpecification
-                init_value = _build_struct_init_value(data_type, struct_defs)
-                constant = ar_element.ConstantSpecification(constant_name, init_value)
+            if array_size is not None or base_type in struct_defs:
+                constant = _shared_init_constant(workspace, elem['data_type'], struct_defs, shared_constants)
             else:
                 # 基本类型：数值 0
+                constant_name = _unique_constant_name(f"{element_name}_IV", used_names)
                 constant = ar_element.ConstantSpecification.make_constant(constant_name, 0)
+                workspace.add_element("Constants", constant)
+            element_constants[element_name] = constant
 
-            workspace.add_element("Constants", constant)
+    return element_constants
 
 
 def read_excel_data(excel_file: str):
     """
     读取Excel文件并解析接口信息
-    返回 (main_df, struct_df, csop_df) 元组，struct_df 和 csop_df 可能为 None
+    返回 (main_df, struct_df, csop_df, runnable_df) 元组，后三者可能为 None
     """
     try:
         df = pd.read_excel(excel_file, sheet_name=0)
@@ -396,19 +627,50 @@ def read_excel_data(excel_file: str):
         except ValueError:
             print("No CSOperation sheet found, using default invalue/outvalue for CS operations")
 
-        return df, struct_df, csop_df
+        # 尝试读取 Runnable sheet（可选）
+        runnable_df = None
+        try:
+            runnable_df = pd.read_excel(excel_file, sheet_name='Runnable')
+            runnable_df.columns = runnable_df.columns.str.strip()
+            print(f"Found Runnable sheet with {len(runnable_df)} rows")
+        except ValueError:
+            print("No Runnable sheet found, using default 100ms runnable for SR ports")
+
+        return df, struct_df, csop_df, runnable_df
     except Exception as e:
         print(f"Error reading Excel file: {e}")
-        return None, None, None
+        return None, None, None, None
 
 
 PRIMITIVE_TYPES = {'uint8', 'uint16', 'uint32', 'float32', 'boolean'}
 
+# 数组类型写法：BaseType[N]，例如 DoorStatus_T[4]
+ARRAY_TYPE_PATTERN = re.compile(r'^\s*(\w+)\s*\[\s*(\d+)\s*\]\s*$')
+
+
+def parse_type_name(type_name):
+    """
+    拆分类型名："DoorStatus_T[4]" -> ("DoorStatus_T", 4)，非数组类型返回 (type_name, None)
+    基本类型名统一为小写
+    """
+    type_name = str(type_name).strip()
+    match = ARRAY_TYPE_PATTERN.match(type_name)
+    base_type, array_size = (match.group(1), int(match.group(2))) if match else (type_name, None)
+    if base_type.lower() in PRIMITIVE_TYPES:
+        base_type = base_type.lower()
+    return base_type, array_size
+
+
+def array_type_name(base_type, array_size):
+    """数组实现数据类型的名称"""
+    return f"{base_type}_Arr{array_size}"
+
 
 def parse_struct_definitions(struct_df):
     """
     解析 Struct sheet 为结构体定义字典
-    返回: OrderedDict { struct_name: [ {member_name, member_type}, ... ] }
+    返回: OrderedDict { struct_name: [ {member_name, member_type, init_value}, ... ] }
+    MemberType 可写作 BaseType[N] 表示数组；可选的 InitValue 列为成员初始值（空则为 0）
     """
     from collections import OrderedDict
 
@@ -423,12 +685,16 @@ def parse_struct_definitions(struct_df):
         struct_name = str(row['StructName']).strip()
         member_name = str(row['MemberName']).strip()
         member_type = str(row['MemberType']).strip()
+        init_value = row.get('InitValue')
+        if init_value is not None and pd.isna(init_value):
+            init_value = None
 
         if struct_name not in structs:
             structs[struct_name] = []
         structs[struct_name].append({
             'member_name': member_name,
-            'member_type': member_type
+            'member_type': member_type,
+            'init_value': init_value
         })
 
     return structs
@@ -444,7 +710,7 @@ def parse_csoperation_definitions(csop_df):
         return {}
 
     csop_defs = {}
-    for _, row in csop_df.iterrows():
+    for row in csop_df.to_dict('records'):
         if pd.isna(row.get('InterfaceName')) or pd.isna(row.get('OperationName')) or pd.isna(row.get('ArgumentName')):
             continue
 
@@ -466,6 +732,129 @@ def parse_csoperation_definitions(csop_df):
     return csop_defs
 
 
+def _parse_bool(value):
+    """
+    解析 TRUE/FALSE/1/0/YES/NO 形式的单元格，空单元格返回 None
+    """
+    if pd.isna(value):
+        return None
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().upper() in ('TRUE', '1', '1.0', 'YES', 'Y')
+
+
+def parse_runnable_definitions(runnable_df):
+    """
+    解析 Runnable sheet 为 runnable 配置字典
+    每行把一个端口（CS 端口可带 OperationName）分配给 RunnableName，
+    同一 runnable 的 PeriodMs/OffsetMs/Trigger/Concurrent/ExclusiveArea 取第一个非空值
+    返回: OrderedDict { runnable_name: {ports, operations, period, offset, trigger, concurrent, exclusive_area} }
+    runnable_df 为 None 时返回空字典
+    """
+    from collections import OrderedDict
+
+    if runnable_df is None or runnable_df.empty:
+        return OrderedDict()
+
+    runnables = OrderedDict()
+    for _, row in runnable_df.iterrows():
+        if pd.isna(row.get('RunnableName')):
+            continue
+
+        name = str(row['RunnableName']).strip()
+        if name not in runnables:
+            runnables[name] = {
+                'ports': [],
+                'operations': [],
+                'period': None,
+                'offset': None,
+                'trigger': None,
+                'concurrent': None,
+                'exclusive_area': None
+            }
+        info = runnables[name]
+
+        if not pd.isna(row.get('PortName')):
+            port_name = str(row['PortName']).strip()
+            if not pd.isna(row.get('OperationName')):
+                info['operations'].append((port_name, str(row['OperationName']).strip()))
+            else:
+                info['ports'].append(port_name)
+
+        if info['period'] is None and not pd.isna(row.get('PeriodMs')):
+            info['period'] = float(row['PeriodMs']) / 1000
+        if info['offset'] is None and not pd.isna(row.get('OffsetMs')):
+            info['offset'] = float(row['OffsetMs']) / 1000
+        if info['trigger'] is None and not pd.isna(row.get('Trigger')):
+            info['trigger'] = str(row['Trigger']).strip().lower()
+        if info['concurrent'] is None:
+            info['concurrent'] = _parse_bool(row.get('Concurrent'))
+        if info['exclusive_area'] is None and not pd.isna(row.get('ExclusiveArea')):
+            info['exclusive_area'] = str(row['ExclusiveArea']).strip()
+
+    return runnables
+
+
+def validate_runnable_definitions(runnable_defs, sr_ports, cs_port_operations, swc_name):
+    """
+    校验 runnable 配置的合法性
+    sr_ports: { port_name: direction }，cs_port_operations: provide CS 端口的 operation 列表
+    sheet 中的 runnable 名不能与自动生成的 runnable（{swc}_Init、{swc}_Run、{swc}_<port>_<op>）重名
+    PeriodMs 必须大于 0、OffsetMs 不能为负；只服务 operation 或由 DataReceived 触发的 runnable 没有定时事件，
+    不能填写 PeriodMs/OffsetMs
+    """
+    cs_keys = {(cs_op['port_name'], cs_op['operation_name']) for cs_op in cs_port_operations}
+    assigned = {}
+    errors = []
+
+    for name, info in runnable_defs.items():
+        if info['trigger'] not in (None, 'timing', 'datareceived'):
+            errors.append(f"Runnable '{name}' has unknown trigger '{info['trigger']}'")
+
+        if info['period'] is not None and info['period'] <= 0:
+            errors.append(f"Runnable '{name}' has non-positive PeriodMs {info['period'] * 1000:g}")
+        if info['offset'] is not None and info['offset'] < 0:
+            errors.append(f"Runnable '{name}' has negative OffsetMs {info['offset'] * 1000:g}")
+        if info['period'] is not None or info['offset'] is not None:
+            if info['operations'] and not info['ports']:
+                errors.append(f"Runnable '{name}' only serves operations and cannot have PeriodMs/OffsetMs")
+            elif info['trigger'] == 'datareceived':
+                errors.append(f"Runnable '{name}' uses DataReceived trigger and cannot have PeriodMs/OffsetMs")
+
+        for port_name in info['ports']:
+            if port_name not in sr_ports:
+                errors.append(f"Runnable '{name}' references unknown SR port '{port_name}'")
+            elif port_name in assigned:
+                errors.append(f"SR port '{port_name}' is assigned to both '{assigned[port_name]}' and '{name}'")
+            else:
+                assigned[port_name] = name
+
+        if info['trigger'] == 'datareceived':
+            if info['operations']:
+                errors.append(f"Runnable '{name}' mixes DataReceived trigger with server operations")
+            if not any(sr_ports.get(p, '').lower() == 'require' for p in info['ports']):
+                errors.append(f"Runnable '{name}' uses DataReceived trigger without any require port")
+
+        for key in info['operations']:
+            if key not in cs_keys:
+                errors.append(f"Runnable '{name}' references unknown server operation '{key[0]}/{key[1]}'")
+
+    # 自动生成的 runnable：Init 总会生成；未分配的 SR 端口归入 {swc}_Run；未分配的 operation 各自生成一个
+    assigned_operations = {key for info in runnable_defs.values() for key in info['operations']}
+    generated_names = {f"{swc_name}_Init"}
+    if any(port_name not in assigned for port_name in sr_ports):
+        generated_names.add(f"{swc_name}_Run")
+    generated_names.update(f"{swc_name}_{port_name}_{operation_name}"
+                           for port_name, operation_name in cs_keys
+                           if (port_name, operation_name) not in assigned_operations)
+    for name in runnable_defs:
+        if name in generated_names:
+            errors.append(f"Runnable '{name}' clashes with a generated runnable of the same name")
+
+    if errors:
+        raise ValueError("Runnable validation errors:\n" + "\n".join(errors))
+
+
 def validate_struct_definitions(struct_defs):
     """
     校验结构体定义的合法性
@@ -483,14 +872,35 @@ def validate_struct_definitions(struct_defs):
         if len(member_names) != len(set(member_names)):
             errors.append(f"Struct '{struct_name}' has duplicate member names")
 
-        # 成员类型必须是基本类型或已定义的结构体
+        # 成员类型必须是基本类型或已定义的结构体（或它们的数组）
         for member in members:
             mt = member['member_type']
-            if mt.lower() not in PRIMITIVE_TYPES and mt not in struct_names:
+            base_type, array_size = parse_type_name(mt)
+            if base_type not in PRIMITIVE_TYPES and base_type not in struct_names:
                 errors.append(
                     f"Struct '{struct_name}' member '{member['member_name']}' "
                     f"has unknown type '{mt}'"
                 )
+            if array_size == 0:
+                errors.append(f"Struct '{struct_name}' member '{member['member_name']}' has zero array size")
+
+            # 初始值仅支持基本类型成员（数组成员的每个元素使用同一初始值）
+            init_value = member.get('init_value')
+            if init_value is None:
+                continue
+            if base_type not in PRIMITIVE_TYPES:
+                errors.append(
+                    f"Struct '{struct_name}' member '{member['member_name']}': "
+                    f"InitValue is only supported for primitive members"
+                )
+                continue
+            try:
+                _parse_init_value(init_value)
+            except ValueError:
+                errors.append(
+                    f"Struct '{struct_name}' member '{member['member_name']}' "
+                    f"has invalid InitValue '{init_value}'"
+                )
 
     if errors:
         raise ValueError("Struct validation errors:\n" + "\n".join(errors))
@@ -508,9 +918,9 @@ def resolve_struct_order(struct_defs):
     for struct_name, members in struct_defs.items():
         deps[struct_name] = set()
         for member in members:
-            mt = member['member_type']
-            if mt.lower() not in PRIMITIVE_TYPES and mt in struct_names:
-                deps[struct_name].add(mt)
+            base_type, _ = parse_type_name(member['member_type'])
+            if base_type not in PRIMITIVE_TYPES and base_type in struct_names:
+                deps[struct_name].add(base_type)
 
     # Kahn 算法拓扑排序
     in_degree = {name: len(dep_set) for name, dep_set in deps.items()}
@@ -520,7 +930,8 @@ def resolve_struct_order(struct_defs):
     while queue:
         current = queue.pop(0)
         order.append(current)
-        for name in struct_names:
+        # 按定义顺序遍历（不遍历 set），保证创建顺序在多次运行间一致
+        for name in struct_defs:
             if current in deps.get(name, set()):
                 deps[name].discard(current)
                 in_degree[name] -= 1
@@ -549,8 +960,11 @@ def create_struct_types(workspace, struct_defs):
         for member in members:
             member_name = member['member_name']
             member_type = member['member_type']
+            base_type, array_size = parse_type_name(member_type)
 
-            if member_type.lower() in PRIMITIVE_TYPES:
+            if array_size is not None:
+                impl_type = create_array_type(workspace, base_type, array_size, created_structs)
+            elif member_type.lower() in PRIMITIVE_TYPES:
                 impl_type = workspace.find_element("PlatformImplementationDataTypes",
                                                    member_type.lower())
             elif member_type in created_structs:
@@ -582,20 +996,26 @@ def create_struct_types(workspace, struct_defs):
     return created_structs
 
 
-def convert_xlsx_to_arxml(excel_file, output_file):
+def build_swc_model(excel_file, reuse_platform=False):
     """
-    主函数
+    解析Excel并在工作空间中构建SWC
+    reuse_platform=True 时复用进程内缓存的平台类型元素（见 cached_platform_elements），不再每次重新创建
+    返回模型字典，供所有输出后端（ARXML、RTE C代码等）共用；Excel读取失败时返回 None
     """
     # 读取Excel数据（主 sheet + 可选的 Struct sheet + 可选的 CSOperation sheet）
-    df, struct_df, csop_df = read_excel_data(excel_file)
+    df, struct_df, csop_df, runnable_df = read_excel_data(excel_file)
     if df is None:
-        return
+        return None
 
     # 创建工作空间
     workspace = autosar.xml.Workspace()
     create_package_map(workspace)
     init_behavior_settings(workspace)
-    create_platform_types(workspace)
+    if reuse_platform:
+        for package_key, element in cached_platform_elements():
+            workspace.add_element(package_key, element)
+    else:
+        create_platform_types(workspace)
 
     # 解析并创建结构体类型（在接口创建之前）
     struct_defs = parse_struct_definitions(struct_df)
@@ -606,6 +1026,9 @@ def convert_xlsx_to_arxml(excel_file, output_file):
 
     # 解析 CSOperation 自定义参数
     csop_defs = parse_csoperation_definitions(csop_df)
+
+    # 解析 Runnable 配置（可选）
+    runnable_defs = parse_runnable_definitions(runnable_df)
     
     # 解析Excel数据
     interface_data = {}
@@ -651,20 +1074,33 @@ def convert_xlsx_to_arxml(excel_file, output_file):
     
     print(f"Found SWC: {swc_name}")
     print(f"Number of ports: {len(port_info)}")
+
+    model = {
+        'workspace': workspace,
+        'swc_name': swc_name,
+        'struct_defs': struct_defs,
+        'row_count': len(port_info),
+        'interfaces': {},
+        'sr_ports': [],
+        'cs_ports': {},
+        'runnables': []
+    }
     
-    # 创建常量
-    create_constants(workspace, interface_data, struct_defs)
+    # 创建常量（结构体/数组类型的初始值按类型共享）
+    element_constants = create_constants(workspace, interface_data, struct_defs)
     
     # 创建接口（根据类型创建SenderReceiver或ClientServer接口）
     created_interfaces = {}
+    # { interface_name: { operation名: operation } }，端口com_spec、operation invoked event与RTE生成共用
+    operation_index = {}
     for interface_name, info in interface_data.items():
         interface_type = info['interface_type'].strip().lower()
 
         if interface_type == 'clientserver':
-            # 创建ClientServer接口，为每个element创建operation
-            for elem in info['elements']:
-                interface = create_clientserver_interface(workspace, interface_name, elem['element_name'], elem['data_type'], struct_types, csop_defs)
+            # 按接口一次性创建ClientServer接口及其全部operation（每个element一个operation）
+            interface = create_clientserver_interface(workspace, interface_name, info['elements'], struct_types, csop_defs)
             created_interfaces[interface_name] = interface
+            operation_index[interface_name] = index_operations(interface)
             op_names = [e['element_name'] for e in info['elements']]
             print(f"Created ClientServer interface: {interface_name} with operations: {op_names}")
         else:
@@ -673,6 +1109,8 @@ def convert_xlsx_to_arxml(excel_file, output_file):
             interface = create_senderreceiver_interface(workspace, interface_name, elem['element_name'], elem['data_type'], struct_types)
             created_interfaces[interface_name] = interface
             print(f"Created SenderReceiver interface: {interface_name}")
+    model['interfaces'] = created_interfaces
+    model['operations'] = operation_index
     
     # 创建应用软件组件
     if swc_name:
@@ -683,6 +1121,7 @@ def convert_xlsx_to_arxml(excel_file, output_file):
         sr_port_names = []  # SenderReceiver端口
         cs_port_operations = []  # ClientServer端口的operation信息
         cs_ports_grouped = {}  # 按port_name分组CS端口信息
+        cs_port_objects = {}  # { port_name: 已创建的CS端口 }
 
         # 先分组收集CS端口的所有operation
         for port in port_info:
@@ -696,6 +1135,7 @@ def convert_xlsx_to_arxml(excel_file, output_file):
                         'operations': []
                     }
                 cs_ports_grouped[pname]['operations'].append(port['element_name'])
+        model['cs_ports'] = {pname: dict(info) for pname, info in cs_ports_grouped.items()}
 
         for port in port_info:
             interface = created_interfaces[port['interface_name']]
@@ -707,7 +1147,9 @@ def convert_xlsx_to_arxml(excel_file, output_file):
                 # 仅在第一次遇到该port时创建（带所有operation的com_spec）
                 if pname in cs_ports_grouped:
                     all_ops = cs_ports_grouped.pop(pname)
-                    create_clientserver_port(swc, pname, interface, all_ops['direction'], all_ops['operations'])
+                    cs_port = create_clientserver_port(swc, pname, interface, all_ops['direction'], all_ops['operations'],
+                                                       operation_index[port['interface_name']])
+                    cs_port_objects[pname] = cs_port
                     print(f"Created {all_ops['direction']} CS port: {pname} with operations: {all_ops['operations']}")
 
                 # 为provide端口的每个operation收集runnable信息
@@ -718,47 +1160,92 @@ def convert_xlsx_to_arxml(excel_file, output_file):
                     })
             else:
                 # SenderReceiver接口需要初始值
-                init_value = workspace.find_element("Constants", f"{element_name}_IV")
+                init_value = element_constants.get(element_name)
                 create_port(swc, port['port_name'], interface, port['direction'],
                            init_value.ref() if init_value else None)
                 sr_port_names.append(port['port_name'])
+                model['sr_ports'].append(port)
                 print(f"Created {port['direction']} SR port: {port['port_name']}")
         
         # 创建内部行为
         behavior = swc.create_internal_behavior()
+
+        if runnable_defs:
+            validate_runnable_definitions(runnable_defs,
+                                          {p['port_name']: p['direction'] for p in model['sr_ports']},
+                                          cs_port_operations, swc_name)
         
-        # 创建排他区域
-        behavior.create_exclusive_area("ExampleExclusiveArea")
+        # 创建排他区域（无 Runnable sheet 时保留默认的 ExampleExclusiveArea）
+        if runnable_defs:
+            exclusive_areas = [info['exclusive_area'] for info in runnable_defs.values() if info['exclusive_area']]
+        else:
+            exclusive_areas = ["ExampleExclusiveArea"]
+        for area_name in dict.fromkeys(exclusive_areas):
+            behavior.create_exclusive_area(area_name)
         
         # 创建可运行实体
         # 1. Init runnable
         init_runnable_name = f"{swc_name}_Init"
         create_runnable(behavior, init_runnable_name, [])
-        
-        # 2. Periodic runnable (用于SenderReceiver端口)
-        if sr_port_names:
-            periodic_runnable_name = f"{swc_name}_Run"
-            create_runnable(behavior, periodic_runnable_name, sr_port_names)
-        
-        # 3. ClientServer operation runnables (每个operation一个runnable)
-        for cs_op in cs_port_operations:
-            cs_runnable_name = f"{swc_name}_{cs_op['port_name']}_{cs_op['operation_name']}"
-            create_runnable(behavior, cs_runnable_name, [])
-            print(f"Created CS runnable: {cs_runnable_name}")
-        
-        # 创建事件
-        # 1. Init event
         behavior.create_init_event(init_runnable_name)
+        model['runnables'].append({'name': init_runnable_name, 'kind': 'init'})
         
-        # 2. Timing event (用于SenderReceiver端口)
-        if sr_port_names:
-            behavior.create_timing_event(periodic_runnable_name, period=0.1)
+        # 2. SenderReceiver runnables：按 Runnable sheet 分组，未分配的端口归入默认 100ms runnable
+        sr_groups = []
+        for name, info in runnable_defs.items():
+            if info['ports'] or not info['operations']:
+                sr_groups.append((name, info['ports'], info))
+        assigned_ports = {p for _, ports, _ in sr_groups for p in ports}
+        unassigned_ports = [p for p in sr_port_names if p not in assigned_ports]
+        if unassigned_ports:
+            sr_groups.append((f"{swc_name}_Run", unassigned_ports, {}))
+
+        for runnable_name, port_names, info in sr_groups:
+            create_runnable(behavior, runnable_name, port_names,
+                            bool(info.get('concurrent')), info.get('exclusive_area'))
+            if info.get('trigger') == 'datareceived':
+                for port in model['sr_ports']:
+                    if port['port_name'] in port_names and port['direction'].lower() == 'require':
+                        behavior.create_data_received_event(runnable_name, port['port_name'])
+                kind = 'data_received'
+            else:
+                period = info.get('period')
+                if period is None:
+                    period = 0.1
+                behavior.create_timing_event(runnable_name, period=period, offset=info.get('offset'))
+                kind = 'periodic'
+            model['runnables'].append({'name': runnable_name, 'kind': kind, 'port_names': port_names})
+            print(f"Created {kind} runnable: {runnable_name} with ports: {port_names}")
         
-        # 3. Operation invoked events (用于ClientServer端口)
+        # 3. ClientServer operation runnables (默认每个operation一个runnable)
+        # 同名 runnable 取第一个（与 behavior.find_runnable 一致）
+        runnables_by_name = {}
+        for runnable in behavior.runnables:
+            runnables_by_name.setdefault(runnable.name, runnable)
+        event_names = EventNameIndex(behavior.events)
+        operation_settings = {}
+        for name, info in runnable_defs.items():
+            for key in info['operations']:
+                operation_settings[key] = (name, info)
         for cs_op in cs_port_operations:
-            cs_runnable_name = f"{swc_name}_{cs_op['port_name']}_{cs_op['operation_name']}"
+            key = (cs_op['port_name'], cs_op['operation_name'])
+            cs_runnable_name, info = operation_settings.get(
+                key, (f"{swc_name}_{cs_op['port_name']}_{cs_op['operation_name']}", {}))
+            if cs_runnable_name not in runnables_by_name or key not in operation_settings:
+                runnable = create_runnable(behavior, cs_runnable_name, [],
+                                           bool(info.get('concurrent')), info.get('exclusive_area'))
+                runnables_by_name.setdefault(cs_runnable_name, runnable)
+                print(f"Created CS runnable: {cs_runnable_name}")
+            model['runnables'].append({'name': cs_runnable_name, 'kind': 'operation',
+                                       'port_name': cs_op['port_name'],
+                                       'operation_name': cs_op['operation_name']})
+
+            # Operation invoked event
             operation_ref = f"{cs_op['port_name']}/{cs_op['operation_name']}"
-            behavior.create_operation_invoked_event(cs_runnable_name, operation_ref)
+            port_interface_name = model['cs_ports'][cs_op['port_name']]['interface_name']
+            create_operation_invoked_event(behavior, event_names, runnables_by_name[cs_runnable_name],
+                                           cs_port_objects[cs_op['port_name']],
+                                           operation_index[port_interface_name][cs_op['operation_name']])
             print(f"Created operation invoked event for: {operation_ref}")
         
         # 创建访问点
@@ -771,20 +1258,220 @@ def convert_xlsx_to_arxml(excel_file, output_file):
         workspace.add_element("ComponentTypes", impl)
         
         print(f"Created SWC: {swc_name}")
-    
-    # 保存XML文件
-    workspace.set_document_root(os.path.join(os.path.dirname(__file__), "generated"))
-    
+
+    model['array_types'] = collect_array_types(workspace)
+    return model
+
+
+def _sort_by_name(items):
+    items.sort(key=lambda item: item.name)
+
+
+def canonicalize_workspace(workspace: ar_workspace.Workspace):
+    """
+    对与语义无关的元素顺序做稳定排序，使Excel行顺序的变化不影响输出
+    结构体成员、operation参数、记录值字段的顺序有语义，保持不变
+    """
+    def visit_package(package):
+        _sort_by_name(package.elements)
+        _sort_by_name(package.packages)
+        for sub_package in package.packages:
+            visit_package(sub_package)
+        for element in package.elements:
+            if isinstance(element, ar_element.ClientServerInterface):
+                _sort_by_name(element.operations)
+            elif isinstance(element, ar_element.ApplicationSoftwareComponentType):
+                _sort_by_name(element.ports)
+                for port in element.ports:
+                    port.com_spec.sort(key=lambda spec: str(getattr(spec, 'operation_ref', '') or ''))
+                behavior = element.internal_behavior
+                if behavior is not None:
+                    _sort_by_name(behavior.exclusive_areas)
+                    _sort_by_name(behavior.events)
+                    _sort_by_name(behavior.runnables)
+                    for runnable in behavior.runnables:
+                        for attr in RUNNABLE_ACCESS_LISTS:
+                            _sort_by_name(getattr(runnable, attr))
+
+    for package in workspace.packages:
+        visit_package(package)
+
+
+def canonicalize_model(model):
+    """
+    规范化整个模型：工作空间元素以及供其他输出后端使用的端口/runnable/结构体列表均按名称排序
+    """
+    from collections import OrderedDict
+
+    canonicalize_workspace(model['workspace'])
+    model['struct_defs'] = OrderedDict(sorted(model['struct_defs'].items()))
+    model['array_types'].sort()
+    model['sr_ports'].sort(key=lambda port: port['port_name'])
+    model['cs_ports'] = dict(sorted(model['cs_ports'].items()))
+    model['runnables'].sort(key=lambda runnable: (runnable['kind'] != 'init', runnable['name']))
+    for runnable in model['runnables']:
+        if 'port_names' in runnable:
+            runnable['port_names'] = sorted(runnable['port_names'])
+
+
+def _make_document(workspace: ar_workspace.Workspace, package_refs):
+    document = ar_document.Document(schema_version=46)
+    for package_ref in package_refs:
+        document.append(workspace.find(package_ref))
+    return document
+
+
+def _serialize_document(document):
+    """
+    序列化为字节：UTF-8 编码与 LF 换行
+    """
+    return Writer().write_str(document, skip_root_attr=False).encode('utf-8')
+
+
+def _write_canonical_document(workspace: ar_workspace.Workspace, file_path: str):
+    """
+    规范化写出：固定包顺序、UTF-8 编码与 LF 换行，返回内容的 SHA-256 摘要
+    """
+    content = _serialize_document(_make_document(workspace, ARXML_PACKAGES))
+    with open(file_path, 'wb') as fh:
+        fh.write(content)
+
+    digest = hashlib.sha256(content).hexdigest()
+    with open(file_path + '.sha256', 'w', encoding='utf-8', newline='\n') as fh:
+        fh.write(f"{digest}  {os.path.basename(file_path)}\n")
+    return digest
+
+
+def render_arxml(model, canonical=False):
+    """
+    将模型序列化为单个ARXML文档的字节内容（不落盘，用于HTTP流式返回）
+    """
+    if canonical:
+        canonicalize_model(model)
+    return _serialize_document(_make_document(model['workspace'], ARXML_PACKAGES))
+
+
+def write_arxml(model, output_file, canonical=False):
+    """
+    将模型中的工作空间写出为ARXML文件
+    canonical=True 时输出字节稳定的规范化ARXML，并在旁边写出 .sha256 摘要文件，返回摘要
+    """
+    workspace = model['workspace']
+    generated_dir = os.path.join(os.path.dirname(__file__), "generated")
+
     # 确保输出目录存在
-    os.makedirs(os.path.join(os.path.dirname(__file__), "generated"), exist_ok=True)
-    
-    # 创建单个文档包含所有内容
-    workspace.create_document(output_file, packages=["/PortInterfaces", "/Constants", 
-                                                    "/AUTOSAR_Platform", "/ComponentTypes"])
-    workspace.write_documents(schema_version=46)
+    os.makedirs(generated_dir, exist_ok=True)
+
+    digest = None
+    if canonical:
+        canonicalize_model(model)
+        digest = _write_canonical_document(workspace, os.path.join(generated_dir, output_file))
+        print(f"Content digest (sha256): {digest}")
+    else:
+        # 保存XML文件
+        workspace.set_document_root(generated_dir)
+
+        # 创建单个文档包含所有内容
+        workspace.create_document(output_file, packages=ARXML_PACKAGES)
+        workspace.write_documents(schema_version=46)
     
     print(f"Generated ARXML file: {output_file}")
     print("Generation completed successfully!")
+    return digest
+
+
+def split_layout(model, split):
+    """
+    返回拆分输出的文件布局 [ (file_name, [package_ref, ...]), ... ]
+    split='package'：每个包一个文件；split='swc'：每个SWC一个文件（含其接口与常量）
+    两种方式都把平台类型写入共享的 AUTOSAR_Platform.arxml
+    """
+    if split == 'package':
+        return [(ref.lstrip('/') + ".arxml", [ref]) for ref in ARXML_PACKAGES]
+    if split == 'swc':
+        swc_refs = [ref for ref in ARXML_PACKAGES if ref != "/AUTOSAR_Platform"]
+        return [(f"{model['swc_name'] or 'result'}.arxml", swc_refs), (PLATFORM_FILE, ["/AUTOSAR_Platform"])]
+    raise ValueError(f"Unknown split mode: {split}")
+
+
+def _write_if_changed(file_path, content):
+    """
+    内容与磁盘上已有文件一致时跳过写入，返回是否写入
+    """
+    if os.path.exists(file_path) and os.path.getsize(file_path) == len(content):
+        with open(file_path, 'rb') as fh:
+            if fh.read() == content:
+                return False
+    with open(file_path, 'wb') as fh:
+        fh.write(content)
+    return True
+
+
+def _platform_cache_get(key):
+    """取出缓存的平台文件内容并在锁内更新命中统计，未命中返回 None"""
+    with _platform_cache_lock:
+        content = _platform_document_cache.get(key)
+        if content is not None:
+            _platform_document_cache.move_to_end(key)
+            platform_cache_stats['hits'] += 1
+        else:
+            platform_cache_stats['misses'] += 1
+        return content
+
+
+def _platform_cache_put(key, content):
+    with _platform_cache_lock:
+        _platform_document_cache[key] = content
+        _platform_document_cache.move_to_end(key)
+        while len(_platform_document_cache) > PLATFORM_CACHE_SIZE:
+            _platform_document_cache.popitem(last=False)
+
+
+def write_split_arxml(model, output_dir, split='package', canonical=False):
+    """
+    按包或按SWC拆分写出多个ARXML文件，依次序列化（纯 Python 的 CPU 开销受 GIL 限制，多线程无法加速）
+    共享的平台文件按结构体定义与数组类型缓存序列化结果，磁盘上已有相同内容时不再重复写出
+    返回 { file_path: sha256 }；canonical=True 时另写出 SHA256SUMS 清单
+    """
+    workspace = model['workspace']
+    if canonical:
+        canonicalize_model(model)
+    output_dir = os.path.join(os.path.dirname(__file__), "generated", output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    platform_key = (canonical, repr(list(model['struct_defs'].items())), repr(model['array_types']))
+    digests = {}
+    for file_name, package_refs in split_layout(model, split):
+        content = _platform_cache_get(platform_key) if file_name == PLATFORM_FILE else None
+        if content is None:
+            content = _serialize_document(_make_document(workspace, package_refs))
+            if file_name == PLATFORM_FILE:
+                _platform_cache_put(platform_key, content)
+        file_path = os.path.join(output_dir, file_name)
+        written = _write_if_changed(file_path, content)
+        digests[file_path] = hashlib.sha256(content).hexdigest()
+        print(f"{'Generated' if written else 'Unchanged'} ARXML file: {file_path}")
+
+    if canonical:
+        with open(os.path.join(output_dir, "SHA256SUMS"), 'w', encoding='utf-8', newline='\n') as fh:
+            for file_path in sorted(digests):
+                fh.write(f"{digests[file_path]}  {os.path.basename(file_path)}\n")
+    print("Generation completed successfully!")
+    return digests
+
+
+def convert_xlsx_to_arxml(excel_file, output_file, canonical=False, split=None):
+    """
+    主函数
+    canonical=True 时返回输出内容的 SHA-256 摘要
+    split 为 'package' 或 'swc' 时 output_file 作为输出目录，返回 { file_path: sha256 }
+    """
+    model = build_swc_model(excel_file)
+    if model is None:
+        return None
+    if split:
+        return write_split_arxml(model, output_file, split, canonical)
+    return write_arxml(model, output_file, canonical)
 
 
 if __name__ == "__main__":
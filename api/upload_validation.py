@@ -0,0 +1,109 @@
+"""
+Upload Validation
+上传文件的大小限制与 xlsx 格式校验：接收过程中即检查文件头和大小，
+落盘与解析之前检查 zip 目录（防 zip 炸弹）和主 sheet 表头
+"""
+import os
+import tempfile
+import zipfile
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge, UnsupportedMediaType
+from openpyxl import load_workbook
+
+# 上传文件大小上限（字节）
+MAX_UPLOAD_BYTES = int(os.getenv('MAX_UPLOAD_BYTES', 5 * 1024 * 1024))
+# 整个请求体上限（文件 + 表单字段的余量）
+MAX_CONTENT_LENGTH = MAX_UPLOAD_BYTES + 64 * 1024
+# xlsx 解压后总大小上限、单条目压缩比上限、条目数上限
+MAX_UNCOMPRESSED_BYTES = int(os.getenv('MAX_XLSX_UNCOMPRESSED_BYTES', 100 * 1024 * 1024))
+MAX_COMPRESSION_RATIO = int(os.getenv('MAX_XLSX_COMPRESSION_RATIO', 200))
+MAX_ZIP_ENTRIES = 1000
+
+# 内存中缓存的上传大小，超过后溢出到临时文件
+SPOOL_MAX_BYTES = 1024 * 1024
+
+ZIP_MAGIC = b'PK\x03\x04'
+
+REQUIRED_COLUMNS = ['SWCName', 'Direction', 'PortName', 'InterfaceName',
+                    'ElementName', 'InterfaceType', 'ElementDataType']
+
+
+class XlsxUploadStream:
+    """
+    multipart 解析时写入的文件流
+    边写边检查：前 4 字节必须是 zip 文件头，累计大小不得超过上限
+    """
+
+    def __init__(self, limit=MAX_UPLOAD_BYTES):
+        self._file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        self._limit = limit
+        self._size = 0
+        self._head = b''
+
+    def write(self, data):
+        if len(self._head) < len(ZIP_MAGIC):
+            self._head += bytes(data[:len(ZIP_MAGIC) - len(self._head)])
+            if not ZIP_MAGIC.startswith(self._head):
+                raise UnsupportedMediaType("仅支持 .xlsx 文件")
+        self._size += len(data)
+        if self._size > self._limit:
+            raise RequestEntityTooLarge(f"文件超过大小限制 {self._limit // 1024} KB")
+        return self._file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def __iter__(self):
+        return iter(self._file)
+
+
+class UploadRequest(Request):
+    """
+    使用 XlsxUploadStream 接收上传文件的请求类
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return XlsxUploadStream()
+
+
+def validate_xlsx_upload(stream):
+    """
+    在落盘和解析之前校验上传的 xlsx
+    检查 zip 目录（条目数、解压总大小、压缩比）与主 sheet 表头，不合法时抛出 ValueError
+    """
+    stream.seek(0)
+    try:
+        archive = zipfile.ZipFile(stream)
+    except zipfile.BadZipFile:
+        raise ValueError("文件不是有效的 xlsx 文件")
+
+    entries = archive.infolist()
+    if len(entries) > MAX_ZIP_ENTRIES:
+        raise ValueError("xlsx 文件包含的条目过多")
+    names = {entry.filename for entry in entries}
+    if 'xl/workbook.xml' not in names:
+        raise ValueError("文件不是有效的 xlsx 文件")
+
+    total_size = 0
+    for entry in entries:
+        total_size += entry.file_size
+        if entry.compress_size and entry.file_size / entry.compress_size > MAX_COMPRESSION_RATIO:
+            raise ValueError("xlsx 文件压缩比异常")
+    if total_size > MAX_UNCOMPRESSED_BYTES:
+        raise ValueError("xlsx 文件解压后过大")
+
+    # 只读模式仅加载主 sheet 第一行
+    stream.seek(0)
+    try:
+        workbook = load_workbook(stream, read_only=True)
+        header_row = next(workbook.worksheets[0].iter_rows(min_row=1, max_row=1, values_only=True), ())
+        workbook.close()
+    except Exception:
+        raise ValueError("无法读取 xlsx 文件")
+
+    header = {str(cell).strip() for cell in header_row if cell is not None}
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise ValueError(f"主 sheet 缺少列: {', '.join(missing)}")
+
+    stream.seek(0)
@@ -0,0 +1,202 @@
+"""
+Usage Log
+使用日志异步写入：请求线程只把事件放入进程内队列，后台线程批量写入 PostgreSQL（多行 INSERT）
+
+耗时与错误信息需要的表结构变更：
+    ALTER TABLE code_usage_logs ADD COLUMN duration_ms integer, ADD COLUMN error_message text;
+未执行时自动退化为原有的四列 INSERT（只丢失耗时与错误信息，使用记录照常写入）
+写入失败的批次放回队列稍后重试，队列已满、写入失败或进程退出时未写出的事件计入 swc_usage_log_dropped_total
+
+Vercel 等 serverless 环境在响应返回后会冻结函数实例，后台线程和 atexit 都不可靠，
+此时（VERCEL 已设置，或 USAGE_LOG_SYNC=1）改为同步模式：事件仍先入队，
+由调用方在响应发送完成后（response.call_on_close）调用 flush() 在请求线程中写入
+"""
+import os
+import queue
+import atexit
+import threading
+import psycopg2
+import psycopg2.errors
+from psycopg2.extras import execute_values
+from api.metrics import DB_LATENCY, USAGE_LOG_DROPPED
+
+USAGE_LOG_BATCH_SIZE = int(os.getenv('USAGE_LOG_BATCH_SIZE', 100))
+# 最长攒批时间（秒）
+USAGE_LOG_FLUSH_INTERVAL = float(os.getenv('USAGE_LOG_FLUSH_INTERVAL', 2))
+# 队列上限，数据库长时间不可用时丢弃新事件而不是阻塞请求
+USAGE_LOG_MAX_QUEUE = 10000
+# 同步模式：不启动后台线程，由 flush() 写入
+USAGE_LOG_SYNC = os.getenv('USAGE_LOG_SYNC', '1' if os.getenv('VERCEL') else '0') == '1'
+
+INSERT_SQL = """
+    INSERT INTO code_usage_logs (code_id, user_ip, user_agent, success, duration_ms, error_message)
+    VALUES %s
+"""
+# 表中还没有 duration_ms / error_message 列时使用
+LEGACY_INSERT_SQL = """
+    INSERT INTO code_usage_logs (code_id, user_ip, user_agent, success)
+    VALUES %s
+"""
+
+
+class UsageLogWriter:
+    """
+    后台批量写入使用日志
+    写线程在首次 log() 时按进程启动（兼容预先 fork 的多进程部署），进程退出时写完剩余事件
+    synchronous=True 时不启动写线程，事件由 flush() 在调用线程中写入
+    """
+
+    def __init__(self, database_url, batch_size=USAGE_LOG_BATCH_SIZE, flush_interval=USAGE_LOG_FLUSH_INTERVAL,
+                 synchronous=USAGE_LOG_SYNC):
+        self.database_url = database_url
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.synchronous = synchronous
+        self._queue = queue.Queue(maxsize=USAGE_LOG_MAX_QUEUE)
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        # 表中是否有 duration_ms / error_message 列（首次写入发现缺列后改用四列 INSERT）
+        self.extended_columns = True
+        atexit.register(self.close)
+
+    def log(self, code_id, user_ip, user_agent, success, duration_ms=None, error_message=None):
+        """记录一次使用事件（不阻塞）"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((code_id, user_ip, user_agent, success, duration_ms, error_message))
+        except queue.Full:
+            USAGE_LOG_DROPPED.inc('queue_full')
+            print("Usage log queue full, dropping event")
+
+    def flush(self):
+        """
+        在调用线程中写入队列中的全部事件（同步模式下每个请求结束后调用）
+        写入失败时剩余事件留在队列中，由下一次 flush() 重试
+        """
+        if self._pid != os.getpid():
+            return
+        while True:
+            batch = self._take_batch()
+            if not batch or not self._write(batch):
+                return
+
+    def close(self):
+        """
+        停止写线程并写完队列中剩余的事件；
+        写线程在超时内没有结束时，队列中仍未写出的事件计入 dropped（reason=shutdown）
+        """
+        if self._pid != os.getpid():
+            return
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            if self._thread.is_alive():
+                pending = self._queue.qsize()
+                if pending:
+                    USAGE_LOG_DROPPED.inc('shutdown', amount=pending)
+                    print(f"Usage log writer did not finish, dropping {pending} event(s) on shutdown")
+                return
+        # 同步模式（或写线程已退出）时在当前线程写完，写入失败的批次按 write_failed 计数
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            self._write(batch)
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # fork 之后子进程中的线程不存在，需要重新创建队列和线程
+                if self._pid is not None:
+                    self._queue = queue.Queue(maxsize=USAGE_LOG_MAX_QUEUE)
+                    self._stop = threading.Event()
+                    self._thread = None
+                self._pid = os.getpid()
+                if not self.synchronous:
+                    self._thread = threading.Thread(target=self._run, name='usage-log-writer', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._collect_batch()
+            if batch:
+                self._write(batch)
+
+    def _collect_batch(self):
+        """最多等待 flush_interval 秒，攒够 batch_size 条立即返回"""
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_interval))
+        except queue.Empty:
+            return batch
+        return batch + self._take_batch(self.batch_size - 1)
+
+    def _take_batch(self, limit=None):
+        """不等待地取出最多 limit（默认 batch_size）条事件"""
+        limit = self.batch_size if limit is None else limit
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _insert(self, conn, batch):
+        if self.extended_columns:
+            try:
+                with conn.cursor() as cursor:
+                    execute_values(cursor, INSERT_SQL, batch, page_size=self.batch_size)
+                return
+            except psycopg2.errors.UndefinedColumn:
+                conn.rollback()
+                self.extended_columns = False
+                print("code_usage_logs has no duration_ms/error_message columns, "
+                      "falling back to the four-column insert (see api/usage_log.py for the migration)")
+        with conn.cursor() as cursor:
+            execute_values(cursor, LEGACY_INSERT_SQL, [event[:4] for event in batch], page_size=self.batch_size)
+
+    def _write(self, batch):
+        """写入一个批次，成功返回 True；失败时按 _requeue 的规则放回队列或丢弃"""
+        error = None
+        for attempt in range(2):
+            conn = None
+            try:
+                with DB_LATENCY.time('usage_log_batch'):
+                    conn = psycopg2.connect(self.database_url)
+                    self._insert(conn, batch)
+                    conn.commit()
+                return True
+            except Exception as e:
+                error = e
+                print(f"Failed to write {len(batch)} usage log(s) (attempt {attempt + 1}): {e}")
+            finally:
+                if conn is not None:
+                    conn.close()
+        self._requeue(batch, error)
+        return False
+
+    def _requeue(self, batch, error):
+        """
+        连接类错误（数据库暂不可用）时把批次放回队列，等待 flush_interval 后再重试（同步模式下不等待，
+        留给下一次 flush()）；数据本身出错、进程退出中或队列已满时丢弃并计数
+        """
+        if self._stop.is_set() or not isinstance(error, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+            USAGE_LOG_DROPPED.inc('write_failed', amount=len(batch))
+            print(f"Dropping {len(batch)} usage log(s) after failed writes: {error}")
+            return
+        dropped = 0
+        for event in batch:
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                dropped += 1
+        if dropped:
+            USAGE_LOG_DROPPED.inc('queue_full', amount=dropped)
+            print(f"Usage log queue full, dropping {dropped} event(s) after failed writes")
+        if not self.synchronous:
+            self._stop.wait(self.flush_interval)
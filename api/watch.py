@@ -0,0 +1,161 @@
+"""
+Watch Mode
+常驻进程监视一组工作簿，保存后（去抖）只重新生成发生变化的工作簿的输出
+进程保持常驻：autosar/pandas 只导入一次，平台类型元素与拆分输出时平台文件的序列化结果在多次生成之间复用
+每个工作簿输出到 <output-dir>/<文件名>_<路径摘要>/（不同目录下的同名工作簿互不覆盖），
+每次生成后删除目录中不再属于输出的旧文件
+
+用法（在仓库根目录）：
+    python -m api.watch myswcautosar.xlsx other.xlsx --outputs arxml,rte --split package
+"""
+import io
+import os
+import sys
+import time
+import hashlib
+import argparse
+import contextlib
+from api.swc_generator import build_swc_model, canonicalize_model
+from api.output_backends import parse_backend_names, run_backends
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "generated")
+# 轮询间隔、文件停止变化多久后才开始生成（秒）
+POLL_INTERVAL = 0.2
+DEBOUNCE_SECONDS = 0.5
+
+
+class WatchedWorkbook:
+    """
+    单个工作簿的监视状态：文件签名（mtime, size）、上次生成时的内容摘要、待生成的时间点
+    """
+
+    def __init__(self, path, output_dir):
+        self.path = os.path.realpath(path)
+        stem = os.path.splitext(os.path.basename(self.path))[0]
+        path_digest = hashlib.sha256(self.path.encode('utf-8')).hexdigest()[:8]
+        self.output_dir = os.path.join(os.path.abspath(output_dir), f"{stem}_{path_digest}")
+        self.signature = None
+        self.digest = None
+        self.due = None
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            # Excel 保存时可能先删除再重命名，短暂不存在视为仍在变化
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self, now, debounce):
+        """
+        检查文件签名，变化后推迟 debounce 秒；到期且文件已稳定时返回 True
+        """
+        signature = self._stat()
+        if signature != self.signature:
+            self.signature = signature
+            self.due = now + debounce
+            return False
+        return self.due is not None and now >= self.due and signature is not None
+
+    def content_changed(self):
+        """内容摘要与上次生成时相同（仅修改时间变化）时跳过生成"""
+        with open(self.path, 'rb') as fh:
+            digest = hashlib.sha256(fh.read()).hexdigest()
+        if digest == self.digest:
+            return False
+        self.digest = digest
+        return True
+
+
+def remove_stale_outputs(output_dir, paths):
+    """
+    删除输出目录中不在 paths 里的文件（改名的 SWC、取消的后端或拆分方式留下的旧输出）及随之变空的子目录
+    返回删除的文件列表
+    """
+    keep = {os.path.abspath(path) for path in paths}
+    removed = []
+    for root, _, file_names in os.walk(output_dir, topdown=False):
+        for file_name in file_names:
+            file_path = os.path.join(root, file_name)
+            if file_path not in keep:
+                os.remove(file_path)
+                removed.append(file_path)
+        if root != output_dir and not os.listdir(root):
+            os.rmdir(root)
+    return removed
+
+
+def regenerate(workbook, backends, canonical, split, verbose):
+    """
+    重新生成单个工作簿的全部输出并清理旧文件，返回 (生成的文件列表, 删除的文件列表)
+    """
+    output = sys.stdout if verbose else io.StringIO()
+    with contextlib.redirect_stdout(output):
+        model = build_swc_model(workbook.path, reuse_platform=True)
+        if model is None:
+            raise ValueError(f"Failed to read {workbook.path}")
+        model['canonical'] = canonical
+        model['split'] = split
+        if canonical:
+            canonicalize_model(model)
+        paths = run_backends(model, workbook.output_dir, backends)
+    return paths, remove_stale_outputs(workbook.output_dir, paths)
+
+
+def watch(paths, output_dir=DEFAULT_OUTPUT_DIR, backends=None, canonical=False, split=None,
+          poll_interval=POLL_INTERVAL, debounce=DEBOUNCE_SECONDS, verbose=False):
+    """
+    监视循环：启动时生成一次全部输出，之后只处理发生变化的工作簿，Ctrl+C 退出
+    """
+    # 同一文件（不同写法/符号链接）只监视一次
+    workbooks = list({workbook.path: workbook
+                      for workbook in (WatchedWorkbook(path, output_dir) for path in paths)}.values())
+    print(f"Watching {len(workbooks)} workbook(s), output: {os.path.abspath(output_dir)} (Ctrl+C to stop)")
+    try:
+        while True:
+            now = time.monotonic()
+            for workbook in workbooks:
+                if not workbook.poll(now, debounce):
+                    continue
+                workbook.due = None
+                if not workbook.content_changed():
+                    continue
+                started = time.perf_counter()
+                try:
+                    paths_written, removed = regenerate(workbook, backends, canonical, split, verbose)
+                except Exception as e:
+                    # 清除摘要，下次保存（即使内容未变）时重试
+                    workbook.digest = None
+                    print(f"[{time.strftime('%H:%M:%S')}] {os.path.basename(workbook.path)}: failed: {e}")
+                    continue
+                elapsed = (time.perf_counter() - started) * 1000
+                stale = f", removed {len(removed)} stale file(s)" if removed else ""
+                print(f"[{time.strftime('%H:%M:%S')}] {os.path.basename(workbook.path)}: "
+                      f"{len(paths_written)} file(s) in {elapsed:.0f} ms{stale} -> {workbook.output_dir}")
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        print("Stopped watching")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate outputs whenever a workbook is saved")
+    parser.add_argument('workbooks', nargs='+')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--outputs', default='arxml', help="逗号分隔的输出后端，例如 arxml,rte")
+    parser.add_argument('--split', choices=['package', 'swc'])
+    parser.add_argument('--canonical', action='store_true')
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS)
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL)
+    parser.add_argument('--verbose', action='store_true', help="显示生成过程的详细输出")
+    args = parser.parse_args(argv)
+
+    try:
+        backends = parse_backend_names(args.outputs)
+    except ValueError as e:
+        parser.error(str(e))
+    watch(args.workbooks, args.output_dir, backends, args.canonical, args.split,
+          args.interval, args.debounce, args.verbose)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+回归测试公共设置
+
+运行：python -m pytest -q tests
+更新 golden 文件：UPDATE_GOLDEN=1 python -m pytest -q tests/test_golden.py
+性能回归：峰值内存默认检查，吞吐量需 RUN_PERF=1 python -m pytest -q tests/test_performance.py
+更新性能基线：UPDATE_PERF_BASELINE=1 python -m pytest -q tests/test_performance.py
+Schema 校验需要 AUTOSAR R4.6 的 AUTOSAR_00046.xsd（受 AUTOSAR 许可限制，不随仓库分发），
+放到 tests/schema/ 或用 AUTOSAR_XSD 指定路径；找不到时 test_schema_valid 全部跳过，即默认运行从不做 Schema 校验
+"""
+import os
+import pytest
+from api.swc_generator import build_swc_model, render_arxml
+from tests.corpus import CORPUS
+
+TESTS_DIR = os.path.dirname(__file__)
+GOLDEN_DIR = os.path.join(TESTS_DIR, 'golden')
+
+
+def generate_canonical(workbook_path):
+    """工作簿 -> 规范化 ARXML 字节内容"""
+    model = build_swc_model(workbook_path)
+    assert model is not None, f"Failed to build model from {workbook_path}"
+    return render_arxml(model, canonical=True)
+
+
+@pytest.fixture(scope='session')
+def corpus_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp('corpus')
+
+
+@pytest.fixture(scope='session', params=sorted(CORPUS))
+def corpus_case(request, corpus_dir):
+    """(用例名, 工作簿路径, golden 文件路径)"""
+    build, golden_name = CORPUS[request.param]
+    workbook_path = str(corpus_dir / f"{request.param}.xlsx")
+    if not os.path.exists(workbook_path):
+        build(workbook_path)
+    return request.param, workbook_path, os.path.join(GOLDEN_DIR, f"{golden_name}.arxml")
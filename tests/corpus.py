@@ -0,0 +1,144 @@
+"""
+回归测试用的工作簿语料：仓库自带的 myswcautosar.xlsx 及由它派生/合成的变体
+每个构建函数把工作簿写到给定路径，内容完全确定（同一输入总是生成相同的 ARXML）
+"""
+import os
+import shutil
+import openpyxl
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SAMPLE_WORKBOOK = os.path.join(ROOT_DIR, 'myswcautosar.xlsx')
+
+MAIN_COLUMNS = ['ItemNumber', 'SWCName', 'Direction', 'PortName', 'InterfaceName',
+                'ElementName', 'InterfaceType', 'ElementDataType']
+STRUCT_COLUMNS = ['StructName', 'MemberName', 'MemberType', 'InitValue']
+CSOP_COLUMNS = ['InterfaceName', 'OperationName', 'ArgumentName', 'ArgumentDirection', 'ArgumentType']
+RUNNABLE_COLUMNS = ['RunnableName', 'PortName', 'OperationName', 'PeriodMs', 'OffsetMs',
+                    'Trigger', 'Concurrent', 'ExclusiveArea']
+
+SR_TYPES = ['uint8', 'uint16', 'uint32', 'float32', 'boolean', 'Position_T', 'uint16[4]']
+
+
+def _main_rows(workbook):
+    """主 sheet 中非空的数据行"""
+    sheet = workbook.worksheets[0]
+    return [row[:len(MAIN_COLUMNS)] for row in sheet.iter_rows(min_row=2, values_only=True)
+            if any(cell is not None for cell in row[1:len(MAIN_COLUMNS)])]
+
+
+def _rewrite_main_rows(workbook, rows):
+    sheet = workbook.worksheets[0]
+    sheet.delete_rows(2, sheet.max_row)
+    for row in rows:
+        sheet.append(list(row))
+
+
+def _append_sheet(workbook, title, columns, rows):
+    sheet = workbook.create_sheet(title)
+    sheet.append(columns)
+    for row in rows:
+        sheet.append(list(row))
+
+
+def build_sample(path):
+    """仓库自带的示例工作簿"""
+    shutil.copyfile(SAMPLE_WORKBOOK, path)
+
+
+def build_sample_reordered(path):
+    """示例工作簿，主 sheet 行顺序反转（规范化输出应与 sample 完全相同）"""
+    workbook = openpyxl.load_workbook(SAMPLE_WORKBOOK)
+    _rewrite_main_rows(workbook, reversed(_main_rows(workbook)))
+    workbook.save(path)
+
+
+def build_main_only(path):
+    """只有主 sheet：无结构体，CS 操作使用主 sheet 中的类型生成默认 invalue/outvalue"""
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = 'Overview'
+    sheet.append(MAIN_COLUMNS)
+    source = openpyxl.load_workbook(SAMPLE_WORKBOOK)
+    for row in _main_rows(source):
+        row = list(row)
+        if row[6] == 'ClientServer':
+            row[7] = 'uint16'
+        if row[7] in {'uint8', 'uint16', 'float32'}:
+            sheet.append(row)
+    workbook.save(path)
+
+
+def build_runnables(path):
+    """示例工作簿 + Runnable sheet（周期、数据接收触发、操作调用、互斥区）"""
+    workbook = openpyxl.load_workbook(SAMPLE_WORKBOOK)
+    _append_sheet(workbook, 'Runnable', RUNNABLE_COLUMNS, [
+        ['VehContrl_Fast', 'VehSpd', None, 10, 2, None, None, 'EA_Fast'],
+        ['VehContrl_Fast', 'LockCmd'],
+        ['VehContrl_OnDoor', 'DoorSts', None, None, None, 'DataReceived'],
+        ['VehContrl_OnDoor', 'FrLeDoorSts'],
+        ['VehContrl_Window', 'SetWindowCmd', 'method1', None, None, None, 'TRUE'],
+    ])
+    workbook.save(path)
+
+
+def build_arrays(path):
+    """示例工作簿 + 数组类型（元素/结构体成员/结构体数组）与 InitValue"""
+    workbook = openpyxl.load_workbook(SAMPLE_WORKBOOK)
+    _rewrite_main_rows(workbook, _main_rows(workbook) + [
+        [None, 'VehContrl', 'require', 'Doors', 'DoorsIf', 'Doors', 'SenderReceiver', 'DoorStatus_T[4]'],
+        [None, 'VehContrl', 'provide', 'Raw', 'RawIf', 'Raw', 'SenderReceiver', 'uint8[8]'],
+        [None, 'VehContrl', 'provide', 'VehInfo', 'VehInfoIf', 'VehInfo', 'SenderReceiver', 'VehicleInfo_T'],
+    ])
+    struct_sheet = workbook['Struct']
+    struct_sheet.cell(row=1, column=4).value = 'InitValue'
+    struct_sheet.cell(row=3, column=4).value = 'TRUE'
+    struct_sheet.cell(row=4, column=4).value = 100
+    struct_sheet.append(['VehicleInfo_T', 'AllDoors', 'DoorStatus_T[2]'])
+    struct_sheet.append(['VehicleInfo_T', 'Samples', 'uint16[3]', 7])
+    workbook.save(path)
+
+
+def build_synthetic(path, sr_ports=40, cs_interfaces=4, operations_per_interface=5, swc_name='BodyCtrl'):
+    """
+    合成工作簿：sr_ports 个 SR 端口（轮流使用基础类型、结构体、数组），
+    cs_interfaces 个 CS 接口，每个接口 operations_per_interface 个带参数的操作
+    """
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = 'Overview'
+    sheet.append(MAIN_COLUMNS)
+    for index in range(sr_ports):
+        name = f"Sig{index:04d}"
+        direction = 'provide' if index % 2 else 'require'
+        sheet.append([None, swc_name, direction, name, f"{name}If", name, 'SenderReceiver',
+                      SR_TYPES[index % len(SR_TYPES)]])
+    for interface_index in range(cs_interfaces):
+        interface_name = f"Diag{interface_index:02d}If"
+        for operation_index in range(operations_per_interface):
+            sheet.append([None, swc_name, 'provide', f"Diag{interface_index:02d}", interface_name,
+                          f"Op{operation_index:03d}", 'ClientServer', 'NULL'])
+
+    _append_sheet(workbook, 'Struct', STRUCT_COLUMNS, [
+        ['Position_T', 'X', 'uint16', 0],
+        ['Position_T', 'Y', 'uint16', 0],
+        ['Position_T', 'Valid', 'boolean', 'TRUE'],
+    ])
+    _append_sheet(workbook, 'CSOperation', CSOP_COLUMNS, [
+        [f"Diag{interface_index:02d}If", f"Op{operation_index:03d}", argument, direction, arg_type]
+        for interface_index in range(cs_interfaces)
+        for operation_index in range(operations_per_interface)
+        for argument, direction, arg_type in (('request', 'IN', 'uint8'), ('position', 'IN', 'Position_T'),
+                                              ('response', 'OUT', 'uint16'))
+    ])
+    workbook.save(path)
+
+
+# 语料：名称 -> (构建函数, 对应的 golden 文件名)
+CORPUS = {
+    'sample': (build_sample, 'sample'),
+    'sample_reordered': (build_sample_reordered, 'sample'),
+    'main_only': (build_main_only, 'main_only'),
+    'runnables': (build_runnables, 'runnables'),
+    'arrays': (build_arrays, 'arrays'),
+    'synthetic': (build_synthetic, 'synthetic'),
+}
@@ -0,0 +1,40 @@
+"""
+初始值常量命名：<Element>_IV 与共享的 <Type>_IV 重名时不应冲突
+"""
+import openpyxl
+import pytest
+from api.swc_generator import build_swc_model
+from tests.corpus import SAMPLE_WORKBOOK, _main_rows, _rewrite_main_rows
+
+
+def _workbook_with_rows(tmp_path, rows, prepend=False):
+    workbook = openpyxl.load_workbook(SAMPLE_WORKBOOK)
+    sample_rows = _main_rows(workbook)
+    _rewrite_main_rows(workbook, rows + sample_rows if prepend else sample_rows + rows)
+    path = str(tmp_path / 'constants.xlsx')
+    workbook.save(path)
+    return path
+
+
+def _constant_names(model):
+    return [element.name for element in model['workspace'].find('/Constants').elements]
+
+
+@pytest.mark.parametrize('prepend', [False, True])
+def test_element_named_like_shared_constant(tmp_path, prepend):
+    # 基本类型 element DoorStatus_T 与结构体 DoorStatus_T 的共享常量同名，不论行的先后顺序
+    row = [None, 'VehContrl', 'require', 'DoorPos', 'DoorPosIf', 'DoorStatus_T', 'SenderReceiver', 'uint8']
+    names = _constant_names(build_swc_model(_workbook_with_rows(tmp_path, [row], prepend)))
+    assert len(names) == len(set(names))
+    assert 'DoorStatus_T_IV' in names
+    assert 'DoorStatus_T_IV_1' in names
+
+
+def test_array_constant_name_is_reserved(tmp_path):
+    path = _workbook_with_rows(tmp_path, [
+        [None, 'VehContrl', 'require', 'Raw', 'RawIf', 'uint8_Arr8', 'SenderReceiver', 'uint16'],
+        [None, 'VehContrl', 'provide', 'Bytes', 'BytesIf', 'Bytes', 'SenderReceiver', 'uint8[8]'],
+    ])
+    names = _constant_names(build_swc_model(path))
+    assert len(names) == len(set(names))
+    assert {'uint8_Arr8_IV', 'uint8_Arr8_IV_1'} <= set(names)
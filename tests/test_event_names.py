@@ -0,0 +1,69 @@
+"""
+EventNameIndex 必须与 autosar 库的 make_unique_name_in_list 生成完全相同的事件名（含已有事件的改名）
+"""
+import random
+import pytest
+from autosar.xml.element import make_unique_name_in_list
+from api.swc_generator import EventNameIndex
+
+
+class _Event:
+    def __init__(self, name):
+        self.name = name
+
+
+class _Behavior:
+    def __init__(self):
+        self.events = []
+
+    def append_event(self, event):
+        self.events.append(event)
+
+
+def _names(events):
+    return [event.name for event in events]
+
+
+def _run_both(existing, base_names):
+    """对同一序列分别用库函数与 EventNameIndex 生成事件，返回两边的事件名列表"""
+    expected = [_Event(name) for name in existing]
+    for base_name in base_names:
+        expected.append(_Event(make_unique_name_in_list(expected, base_name)))
+
+    behavior = _Behavior()
+    behavior.events = [_Event(name) for name in existing]
+    index = EventNameIndex(behavior.events)
+    for base_name in base_names:
+        index.append(behavior, _Event(index.unique_name(base_name)))
+    return _names(expected), _names(behavior.events)
+
+
+def test_unique_name_without_conflict():
+    expected, actual = _run_both(['TMT_Run'], ['OIT_R_P_op'])
+    assert actual == expected == ['TMT_Run', 'OIT_R_P_op']
+
+
+def test_duplicate_renames_existing_to_zero():
+    expected, actual = _run_both([], ['OIT_R_P_op', 'OIT_R_P_op', 'OIT_R_P_op'])
+    assert actual == expected == ['OIT_R_P_op_0', 'OIT_R_P_op_1', 'OIT_R_P_op_2']
+
+
+def test_suffix_continues_after_highest_index():
+    expected, actual = _run_both(['OIT_R_P_op_5', 'OIT_R_P_op_2'], ['OIT_R_P_op'])
+    assert actual == expected == ['OIT_R_P_op_5', 'OIT_R_P_op_2', 'OIT_R_P_op_6']
+
+
+def test_prefix_overlapping_names():
+    # Op1 与 Op1_2 这类名称：库函数把 <name>_<数字...> 都视为带序号
+    expected, actual = _run_both([], ['OIT_R_P_Op1_2', 'OIT_R_P_Op1', 'OIT_R_P_Op1x', 'OIT_R_P_Op1'])
+    assert actual == expected
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_matches_library_randomized(seed):
+    rng = random.Random(seed)
+    pool = ['OIT_a', 'OIT_a_1', 'OIT_a_1x', 'OIT_a_b', 'OIT_ab', 'OIT_a_12', 'TMT_a']
+    existing = list(dict.fromkeys(rng.choice(pool) for _ in range(rng.randint(0, 3))))
+    base_names = [rng.choice(pool) for _ in range(rng.randint(1, 12))]
+    expected, actual = _run_both(existing, base_names)
+    assert actual == expected
@@ -0,0 +1,120 @@
+"""
+性能回归：合成的大工作簿（数百个端口、上百个 CS 操作）端到端转换的峰值内存与吞吐量，
+与 tests/perf_baseline.json 中的基线比较，超出 PERF_TOLERANCE（默认 25%）即失败
+
+峰值内存（tracemalloc 统计的 Python 分配）与机器负载无关，默认运行；
+吞吐量与机器和负载相关，默认跳过：RUN_PERF=1 时才执行（在记录基线的同一台机器上使用）
+换机器或有意改变性能后用 UPDATE_PERF_BASELINE=1 重新记录
+"""
+import io
+import os
+import json
+import time
+import contextlib
+import tracemalloc
+import pytest
+from api.swc_generator import build_swc_model, render_arxml
+from tests.conftest import TESTS_DIR
+from tests.corpus import build_synthetic
+
+BASELINE_FILE = os.path.join(TESTS_DIR, 'perf_baseline.json')
+UPDATE_BASELINE = os.getenv('UPDATE_PERF_BASELINE') == '1'
+PERF_TOLERANCE = float(os.getenv('PERF_TOLERANCE', 0.25))
+# 吞吐量取多次运行中最快的一次，减少机器抖动的影响
+PERF_RUNS = int(os.getenv('PERF_RUNS', 3))
+
+# 用例名 -> build_synthetic 参数
+PERF_CASES = {
+    'synthetic_large': {'sr_ports': 400, 'cs_interfaces': 8, 'operations_per_interface': 25},
+}
+
+RUN_PERF = os.getenv('RUN_PERF') == '1' or UPDATE_BASELINE
+
+
+def _convert(workbook_path):
+    """端到端转换（读取工作簿、构建模型、序列化），返回主 sheet 行数"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = build_swc_model(workbook_path)
+        render_arxml(model, canonical=True)
+    return model['row_count']
+
+
+def measure_peak_memory(workbook_path):
+    """单次转换的峰值内存（MB）"""
+    _convert(workbook_path)  # 预热：导入与首次调用的缓存不计入
+    tracemalloc.start()
+    try:
+        _convert(workbook_path)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak_bytes / 1024 / 1024, 2)
+
+
+def measure_throughput(workbook_path):
+    """PERF_RUNS 次转换中最快一次的吞吐量（行/秒）"""
+    _convert(workbook_path)
+    best = None
+    for _ in range(PERF_RUNS):
+        started = time.perf_counter()
+        rows = _convert(workbook_path)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return round(rows / best, 1)
+
+
+def _load_baseline():
+    if not os.path.exists(BASELINE_FILE):
+        return {}
+    with open(BASELINE_FILE, encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def _save_baseline(baseline):
+    with open(BASELINE_FILE, 'w', encoding='utf-8', newline='\n') as fh:
+        json.dump(baseline, fh, indent=2, sort_keys=True)
+        fh.write('\n')
+
+
+@pytest.fixture(scope='module', params=sorted(PERF_CASES))
+def perf_case(request, tmp_path_factory):
+    case = request.param
+    workbook_path = str(tmp_path_factory.mktemp('perf') / f"{case}.xlsx")
+    build_synthetic(workbook_path, **PERF_CASES[case])
+    return case, workbook_path
+
+
+def _check_baseline(case, metric, value):
+    """更新基线时记录 value 并返回 None，否则返回基线值（没有基线时跳过）"""
+    print(f"{case} {metric}: {value}")
+    baseline = _load_baseline()
+    if UPDATE_BASELINE:
+        baseline.setdefault(case, {})[metric] = value
+        _save_baseline(baseline)
+        return None
+    if metric not in baseline.get(case, {}):
+        pytest.skip(f"No {metric} baseline for {case}, run with UPDATE_PERF_BASELINE=1")
+    return baseline[case][metric]
+
+
+def test_peak_memory(perf_case):
+    case, workbook_path = perf_case
+    peak_memory_mb = measure_peak_memory(workbook_path)
+    expected = _check_baseline(case, 'peak_memory_mb', peak_memory_mb)
+    if expected is None:
+        return
+    max_memory = expected * (1 + PERF_TOLERANCE)
+    assert peak_memory_mb <= max_memory, \
+        f"Peak memory regressed: {peak_memory_mb} MB > {max_memory:.2f} (baseline {expected} MB)"
+
+
+@pytest.mark.skipif(not RUN_PERF, reason="throughput test is opt-in, set RUN_PERF=1")
+def test_throughput(perf_case):
+    case, workbook_path = perf_case
+    rows_per_second = measure_throughput(workbook_path)
+    expected = _check_baseline(case, 'rows_per_second', rows_per_second)
+    if expected is None:
+        return
+    min_throughput = expected * (1 - PERF_TOLERANCE)
+    assert rows_per_second >= min_throughput, \
+        f"Throughput regressed: {rows_per_second} rows/s < {min_throughput:.1f} (baseline {expected} rows/s)"
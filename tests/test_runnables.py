@@ -0,0 +1,61 @@
+"""
+Runnable sheet 校验：与自动生成的 runnable 重名、周期/偏移非法时报错
+"""
+import openpyxl
+import pytest
+from api.swc_generator import build_swc_model
+from tests.corpus import SAMPLE_WORKBOOK, RUNNABLE_COLUMNS
+
+SR_PORTS = ['LockCmd', 'LockReq', 'VehSpd', 'FrLeDoorSts', 'ReLeDoorSts', 'DoorSts']
+
+
+def _workbook_with_runnables(tmp_path, rows):
+    workbook = openpyxl.load_workbook(SAMPLE_WORKBOOK)
+    sheet = workbook.create_sheet('Runnable')
+    sheet.append(RUNNABLE_COLUMNS)
+    for row in rows:
+        sheet.append(row)
+    path = str(tmp_path / 'runnables.xlsx')
+    workbook.save(path)
+    return path
+
+
+@pytest.mark.parametrize('name', ['VehContrl_Init', 'VehContrl_Run', 'VehContrl_SetDoorCmd_DoorMethod'])
+def test_generated_name_clash_is_rejected(tmp_path, name):
+    path = _workbook_with_runnables(tmp_path, [[name, 'VehSpd']])
+    with pytest.raises(ValueError, match=f"Runnable '{name}' clashes"):
+        build_swc_model(path)
+
+
+def test_default_names_allowed_when_nothing_is_generated(tmp_path):
+    # 全部 SR 端口已分配时不会生成 {swc}_Run；operation 分配给同名 runnable 时不会再生成默认 runnable
+    rows = [['VehContrl_Run', port_name] for port_name in SR_PORTS]
+    rows.append(['VehContrl_SetDoorCmd_DoorMethod', 'SetDoorCmd', 'DoorMethod'])
+    model = build_swc_model(_workbook_with_runnables(tmp_path, rows))
+    behavior = model['workspace'].find('/ComponentTypes/VehContrl').internal_behavior
+    runnable_names = [runnable.name for runnable in behavior.runnables]
+    assert runnable_names.count('VehContrl_Run') == 1
+    assert runnable_names.count('VehContrl_SetDoorCmd_DoorMethod') == 1
+
+
+@pytest.mark.parametrize('row, message', [
+    (['VehContrl_Fast', 'VehSpd', None, 0], "non-positive PeriodMs 0"),
+    (['VehContrl_Fast', 'VehSpd', None, -10], "non-positive PeriodMs -10"),
+    (['VehContrl_Fast', 'VehSpd', None, 10, -2], "negative OffsetMs -2"),
+    (['VehContrl_Door', 'SetDoorCmd', 'DoorMethod', 10], "only serves operations"),
+    (['VehContrl_Door', 'SetDoorCmd', 'DoorMethod', None, 5], "only serves operations"),
+    (['VehContrl_OnDoor', 'DoorSts', None, 10, None, 'DataReceived'], "DataReceived trigger and cannot have"),
+])
+def test_invalid_timing_is_rejected(tmp_path, row, message):
+    path = _workbook_with_runnables(tmp_path, [row])
+    with pytest.raises(ValueError, match=message):
+        build_swc_model(path)
+
+
+def test_zero_offset_is_kept(tmp_path):
+    model = build_swc_model(_workbook_with_runnables(tmp_path, [['VehContrl_Fast', 'VehSpd', None, 20, 0]]))
+    behavior = model['workspace'].find('/ComponentTypes/VehContrl').internal_behavior
+    events = [event for event in behavior.events if str(event.start_on_event).endswith('/VehContrl_Fast')]
+    assert len(events) == 1
+    assert events[0].period == 0.02
+    assert events[0].offset == 0
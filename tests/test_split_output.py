@@ -0,0 +1,20 @@
+"""
+拆分输出：共享平台文件的缓存不能让不同工作簿的输出互相串用
+"""
+import openpyxl
+from api.swc_generator import convert_xlsx_to_arxml
+from tests.corpus import SAMPLE_WORKBOOK
+
+
+def test_platform_cache_includes_array_types(tmp_path):
+    # 与示例工作簿的 Struct sheet 相同，只多一个数组元素
+    workbook = openpyxl.load_workbook(SAMPLE_WORKBOOK)
+    workbook.worksheets[0].append([None, 'VehContrl', 'provide', 'Raw', 'RawIf', 'Raw', 'SenderReceiver', 'uint8[8]'])
+    array_workbook = str(tmp_path / 'array.xlsx')
+    workbook.save(array_workbook)
+
+    convert_xlsx_to_arxml(SAMPLE_WORKBOOK, str(tmp_path / 'sample'), split='swc')
+    convert_xlsx_to_arxml(array_workbook, str(tmp_path / 'array'), split='swc')
+
+    assert 'uint8_Arr8' in (tmp_path / 'array' / 'VehContrl.arxml').read_text(encoding='utf-8')
+    assert 'uint8_Arr8' in (tmp_path / 'array' / 'AUTOSAR_Platform.arxml').read_text(encoding='utf-8')
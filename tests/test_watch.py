@@ -0,0 +1,32 @@
+"""
+Watch 模式：同名工作簿的输出目录互不覆盖，重新生成后清理旧输出
+"""
+import os
+from api.watch import WatchedWorkbook, regenerate
+from tests.corpus import build_sample
+
+
+def _sample(tmp_path, sub_dir):
+    os.makedirs(tmp_path / sub_dir)
+    path = str(tmp_path / sub_dir / 'myswc.xlsx')
+    build_sample(path)
+    return path
+
+
+def test_same_file_name_gets_separate_output_dirs(tmp_path):
+    output_dir = str(tmp_path / 'out')
+    first = WatchedWorkbook(_sample(tmp_path, 'a'), output_dir)
+    second = WatchedWorkbook(_sample(tmp_path, 'b'), output_dir)
+    assert first.output_dir != second.output_dir
+    assert os.path.basename(first.output_dir).startswith('myswc_')
+    assert WatchedWorkbook(str(tmp_path / 'a' / '..' / 'a' / 'myswc.xlsx'), output_dir).output_dir == first.output_dir
+
+
+def test_stale_outputs_are_removed(tmp_path):
+    workbook = WatchedWorkbook(_sample(tmp_path, 'a'), str(tmp_path / 'out'))
+    split_paths, _ = regenerate(workbook, ['arxml', 'rte'], True, 'package', False)
+    paths, removed = regenerate(workbook, ['arxml'], True, None, False)
+
+    assert sorted(removed) == sorted(split_paths)
+    remaining = [os.path.join(root, name) for root, _, names in os.walk(workbook.output_dir) for name in names]
+    assert sorted(remaining) == sorted(paths)